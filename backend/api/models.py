@@ -2,51 +2,59 @@
 Pydantic models for API request/response schemas.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+import time
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 
 
 class AudioUpload(BaseModel):
     """Model for audio upload request."""
     
-    filename: str = Field(..., description="Name of the uploaded file")
-    file_size: int = Field(..., description="Size of the file in bytes")
-    content_type: str = Field(..., description="MIME type of the file")
-    
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "filename": "song.mp3",
                 "file_size": 5242880,
                 "content_type": "audio/mpeg"
             }
-        }
+        },
+        defer_build=True
+    )
+    
+    filename: str = Field(..., description="Name of the uploaded file")
+    file_size: int = Field(..., description="Size of the file in bytes")
+    content_type: str = Field(..., description="MIME type of the file")
 
 
 class ChordInfo(BaseModel):
     """Model for chord information."""
     
+    model_config = ConfigDict(defer_build=True)
+    
     chord: str = Field(..., description="Chord name (e.g., 'C', 'Am', 'F#m')")
     start_time: float = Field(..., description="Start time in seconds")
     end_time: float = Field(..., description="End time in seconds")
     confidence: float = Field(..., description="Detection confidence (0-1)")
+    
+    @classmethod
+    def validate_many(cls, rows: Iterable[Any]) -> List["ChordInfo"]:
+        """Validate a whole list of chord rows in one call."""
+        return _chord_list_adapter().validate_python(rows)
+
+
+@lru_cache(maxsize=None)
+def _chord_list_adapter() -> TypeAdapter:
+    """Validator for List[ChordInfo], built on first use."""
+    return TypeAdapter(List[ChordInfo])
 
 
 class ProcessingResult(BaseModel):
     """Model for audio processing result."""
     
-    job_id: str = Field(..., description="Unique job identifier")
-    status: str = Field(..., description="Processing status")
-    original_filename: str = Field(..., description="Original uploaded filename")
-    chord_progression: List[ChordInfo] = Field(..., description="Detected chord progression")
-    output_filename: Optional[str] = Field(None, description="Generated output filename")
-    processing_time: Optional[float] = Field(None, description="Processing time in seconds")
-    created_at: datetime = Field(default_factory=datetime.now)
-    error_message: Optional[str] = Field(None, description="Error message if processing failed")
-    
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job_12345",
                 "status": "completed",
@@ -69,17 +77,32 @@ class ProcessingResult(BaseModel):
                 "processing_time": 15.5,
                 "created_at": "2024-01-01T12:00:00Z"
             }
-        }
+        },
+        defer_build=True
+    )
+    
+    job_id: str = Field(..., description="Unique job identifier")
+    status: str = Field(..., description="Processing status")
+    original_filename: str = Field(..., description="Original uploaded filename")
+    chord_progression: List[ChordInfo] = Field(..., description="Detected chord progression")
+    output_filename: Optional[str] = Field(None, description="Generated output filename")
+    processing_time: Optional[float] = Field(None, description="Processing time in seconds")
+    created_at_ns: int = Field(default_factory=time.time_ns, exclude=True,
+                               description="Creation time in nanoseconds since the epoch")
+    error_message: Optional[str] = Field(None, description="Error message if processing failed")
+    
+    @computed_field
+    @property
+    def created_at(self) -> datetime:
+        """Creation time, converted from the stored timestamp only when needed."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
 
 
 class ProcessingRequest(BaseModel):
     """Model for processing request."""
     
-    audio_file_id: str = Field(..., description="ID of uploaded audio file")
-    options: Dict[str, Any] = Field(default_factory=dict, description="Processing options")
-    
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "audio_file_id": "file_12345",
                 "options": {
@@ -88,4 +111,9 @@ class ProcessingRequest(BaseModel):
                     "output_format": "wav"
                 }
             }
-        } 
\ No newline at end of file
+        },
+        defer_build=True
+    )
+    
+    audio_file_id: str = Field(..., description="ID of uploaded audio file")
+    options: Dict[str, Any] = Field(default_factory=dict, description="Processing options")
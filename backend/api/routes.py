@@ -6,16 +6,76 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import FileResponse
 import uuid
 import os
-from typing import List
+import json
+import asyncio
+import aiofiles
+from typing import Any, Dict, List, Optional
 
 from .models import AudioUpload, ProcessingResult, ProcessingRequest, ChordInfo
 
+# Optional Redis backend for upload and job state shared across API workers
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 router = APIRouter(prefix="/api/v1", tags=["chord-singer"])
 
+# Size of each read when streaming uploads to disk, and the largest upload accepted
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
 # In-memory storage for demo (use database in production)
 uploaded_files = {}
 processing_jobs = {}
 
+# Set REDIS_URL (e.g. redis://localhost:6379/0) to keep uploads and jobs in Redis instead,
+# so every uvicorn worker sees the same state; entries expire after STATE_TTL_SECONDS
+REDIS_URL = os.getenv("REDIS_URL")
+STATE_TTL_SECONDS = 86400
+_redis = aioredis.from_url(REDIS_URL, decode_responses=True) if REDIS_AVAILABLE and REDIS_URL else None
+
+
+async def _save_upload(file_id: str, file_info: Dict[str, Any]):
+    """Record an uploaded file's information."""
+    if _redis is None:
+        uploaded_files[file_id] = file_info
+        return
+    key = f"upload:{file_id}"
+    async with _redis.pipeline(transaction=True) as pipe:
+        await pipe.hset(key, mapping=file_info).expire(key, STATE_TTL_SECONDS).execute()
+
+
+async def _load_upload(file_id: str) -> Optional[Dict[str, Any]]:
+    """Return an uploaded file's information, or None if it is unknown."""
+    if _redis is None:
+        return uploaded_files.get(file_id)
+    file_info = await _redis.hgetall(f"upload:{file_id}")
+    if not file_info:
+        return None
+    file_info["file_size"] = int(file_info["file_size"])
+    return file_info
+
+
+async def _save_job(job: ProcessingResult):
+    """Record a job's current state."""
+    if _redis is None:
+        processing_jobs[job.job_id] = job
+        return
+    # created_at_ns is excluded from API output but must survive the round trip
+    data = job.model_dump(mode="json")
+    data["created_at_ns"] = job.created_at_ns
+    await _redis.set(f"job:{job.job_id}", json.dumps(data), ex=STATE_TTL_SECONDS)
+
+
+async def _load_job(job_id: str) -> Optional[ProcessingResult]:
+    """Return a job's current state, or None if it is unknown."""
+    if _redis is None:
+        return processing_jobs.get(job_id)
+    raw = await _redis.get(f"job:{job_id}")
+    return ProcessingResult.model_validate_json(raw) if raw is not None else None
+
 
 @router.post("/upload", response_model=AudioUpload)
 async def upload_audio(file: UploadFile = File(...)):
@@ -45,24 +105,37 @@ async def upload_audio(file: UploadFile = File(...)):
     
     file_path = os.path.join(upload_dir, f"{file_id}_{file.filename}")
     
+    # Stream the upload to disk in chunks so it is never held in memory whole
+    file_size = 0
     try:
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+                    )
+                await buffer.write(chunk)
+    except HTTPException:
+        os.unlink(file_path)
+        raise
     except Exception as e:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
     # Store file information
-    uploaded_files[file_id] = {
+    await _save_upload(file_id, {
         "filename": file.filename,
         "file_path": file_path,
-        "file_size": len(content),
+        "file_size": file_size,
         "content_type": file.content_type
-    }
+    })
     
     return AudioUpload(
         filename=file.filename,
-        file_size=len(content),
+        file_size=file_size,
         content_type=file.content_type
     )
 
@@ -83,11 +156,10 @@ async def process_audio(
         ProcessingResult: Processing job information
     """
     # Validate file exists
-    if request.audio_file_id not in uploaded_files:
+    file_info = await _load_upload(request.audio_file_id)
+    if file_info is None:
         raise HTTPException(status_code=404, detail="Audio file not found")
     
-    file_info = uploaded_files[request.audio_file_id]
-    
     # Generate job ID
     job_id = str(uuid.uuid4())
     
@@ -99,7 +171,7 @@ async def process_audio(
         chord_progression=[]  # Will be populated during processing
     )
     
-    processing_jobs[job_id] = job_result
+    await _save_job(job_result)
     
     # Add background task for processing
     background_tasks.add_task(
@@ -123,10 +195,11 @@ async def get_job_status(job_id: str):
     Returns:
         ProcessingResult: Current job status and results
     """
-    if job_id not in processing_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return processing_jobs[job_id]
+    return job
 
 
 @router.get("/jobs/{job_id}/download")
@@ -140,11 +213,10 @@ async def download_result(job_id: str):
     Returns:
         FileResponse: Processed audio file
     """
-    if job_id not in processing_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = processing_jobs[job_id]
-    
     if job.status != "completed" or not job.output_filename:
         raise HTTPException(status_code=400, detail="Job not completed or no output file")
     
@@ -179,29 +251,31 @@ async def process_audio_background(job_id: str, file_id: str, options: dict):
         # TODO: Implement actual audio processing
         # This is a placeholder implementation
         
-        file_info = uploaded_files[file_id]
+        file_info = await _load_upload(file_id)
         
         # Simulate processing time
-        import asyncio
         await asyncio.sleep(5)
         
         # Generate dummy chord progression
-        chord_progression = [
-            ChordInfo(chord="C", start_time=0.0, end_time=2.0, confidence=0.95),
-            ChordInfo(chord="Am", start_time=2.0, end_time=4.0, confidence=0.92),
-            ChordInfo(chord="F", start_time=4.0, end_time=6.0, confidence=0.88),
-            ChordInfo(chord="G", start_time=6.0, end_time=8.0, confidence=0.91)
-        ]
+        chord_progression = ChordInfo.validate_many([
+            {"chord": "C", "start_time": 0.0, "end_time": 2.0, "confidence": 0.95},
+            {"chord": "Am", "start_time": 2.0, "end_time": 4.0, "confidence": 0.92},
+            {"chord": "F", "start_time": 4.0, "end_time": 6.0, "confidence": 0.88},
+            {"chord": "G", "start_time": 6.0, "end_time": 8.0, "confidence": 0.91}
+        ])
         
         # Update job result
-        job_result = processing_jobs[job_id]
+        job_result = await _load_job(job_id)
         job_result.status = "completed"
         job_result.chord_progression = chord_progression
         job_result.output_filename = f"output_{job_id}.wav"
         job_result.processing_time = 5.0
+        await _save_job(job_result)
         
     except Exception as e:
         # Update job with error
-        job_result = processing_jobs[job_id]
-        job_result.status = "failed"
-        job_result.error_message = str(e) 
\ No newline at end of file
+        job_result = await _load_job(job_id)
+        if job_result is not None:
+            job_result.status = "failed"
+            job_result.error_message = str(e)
+            await _save_job(job_result) 
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Long-lived worker processes for the CPU-bound analysis passes (chord detection and
+melody extraction), so they can run in parallel without blocking each other on the GIL.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from . import fft_backend
+from .chord_detection import get_detector
+from .melody_extraction import get_extractor
+
+
+# One worker per analysis pass
+ANALYSIS_WORKERS = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """
+    Set up the FFT backend and load the madmom and melody models once per worker process,
+    then run one second of silence through both so lazily loaded weights and caches are
+    ready before real traffic.
+    """
+    fft_backend.configure()
+    detector = get_detector()
+    extractor = get_extractor()
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+            warmup_path = temp_file.name
+        try:
+            sf.write(warmup_path, np.zeros(22050, dtype=np.float32), 22050)
+            detector.detect_chords(warmup_path)
+            extractor.extract_melody(warmup_path)
+        finally:
+            os.unlink(warmup_path)
+    except Exception as e:
+        print(f"Warning: analysis worker warm-up failed: {e}")
+
+
+def detect_chords_worker(audio: Union[str, np.ndarray], sr: Optional[int] = None) -> List[Tuple[str, float, float]]:
+    """Detect chords in a worker process using that process's shared detector."""
+    return get_detector().detect_chords(audio, sr)
+
+
+def extract_melody_worker(audio: Union[str, np.ndarray], sr: Optional[int] = None) -> List[Tuple[float, float]]:
+    """Extract the melody contour in a worker process using that process's shared extractor."""
+    return get_extractor().extract_melody(audio, sr)
+
+
+def _worker_pid() -> int:
+    """Report which worker ran the task; the short pause lets the other workers pick up tasks too."""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared analysis pool, creating it on first use.
+    Workers are spawned rather than forked: the parent may already hold TensorFlow, torch
+    and other threaded runtimes that are unsafe to fork. Each worker preloads its models
+    once and serves every job for the life of the pool; the executor only spawns workers
+    as tasks arrive, so call start_analysis_pool() to have them ready before the first job.
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=ANALYSIS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+    return _pool
+
+
+def start_analysis_pool():
+    """
+    Spawn every analysis worker and wait until each has run its initializer.
+    Workers only take tasks once initialized, so small tasks are submitted until each
+    worker has answered at least once.
+    """
+    pool = get_analysis_pool()
+    ready = set()
+    while len(ready) < ANALYSIS_WORKERS:
+        futures = [pool.submit(_worker_pid) for _ in range(ANALYSIS_WORKERS)]
+        ready.update(future.result() for future in futures)
+
+
+def shutdown_analysis_pool():
+    """Shut down the shared analysis pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -4,11 +4,120 @@ Audio utilities for general audio processing tasks.
 
 import numpy as np
 import librosa
+import soundfile as sf
 from pydub import AudioSegment
+from scipy.signal import resample_poly
+from fractions import Fraction
 from typing import Tuple, Optional
 import os
 import tempfile
 
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+
+# Format every preprocessed file is written in, so callers can rely on it without decoding
+PROCESSED_SAMPLE_RATE = 44100
+PROCESSED_CHANNELS = 1
+
+# NumPy sample types for the PCM widths resampled with resample_poly
+_PCM_DTYPES = {2: np.int16, 4: np.int32}
+
+# Bits per sample for the libsndfile subtypes reported by sf.info
+_SUBTYPE_BITS = {
+    'PCM_S8': 8, 'PCM_U8': 8, 'PCM_16': 16, 'PCM_24': 24, 'PCM_32': 32,
+    'FLOAT': 32, 'DOUBLE': 64,
+}
+
+
+def _resample_segment(audio: AudioSegment, frame_rate: int) -> AudioSegment:
+    """
+    Resample a mono AudioSegment with polyphase filtering on its raw PCM.
+    Common rate pairs (e.g. 22050 -> 44100 is 2/1) reduce to small integer ratios, which
+    is far cheaper than a general resampler; other sample widths fall back to pydub.
+    
+    Args:
+        audio: Mono audio segment
+        frame_rate: Target sample rate
+        
+    Returns:
+        Resampled audio segment with the same sample width
+    """
+    dtype = _PCM_DTYPES.get(audio.sample_width)
+    if dtype is None or audio.channels != 1:
+        return audio.set_frame_rate(frame_rate)
+    
+    ratio = Fraction(frame_rate, audio.frame_rate)
+    samples = np.frombuffer(audio.raw_data, dtype=dtype)
+    work_dtype = np.float32 if dtype is np.int16 else np.float64
+    resampled = resample_poly(samples.astype(work_dtype), ratio.numerator, ratio.denominator)
+    limits = np.iinfo(dtype)
+    np.clip(np.rint(resampled, out=resampled), limits.min, limits.max, out=resampled)
+    return AudioSegment(resampled.astype(dtype).tobytes(), frame_rate=frame_rate,
+                        sample_width=audio.sample_width, channels=1)
+
+
+def _new_temp_wav() -> str:
+    """Create an empty temporary .wav file and return its path."""
+    temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+    temp_file.close()
+    return temp_file.name
+
+
+def _convert_with_soundfile(audio_path: str, output_path: str):
+    """
+    Convert a file libsndfile can read to the preprocessed format: downmix to mono,
+    resample to PROCESSED_SAMPLE_RATE with resample_poly and write 16-bit PCM WAV.
+    
+    Args:
+        audio_path: Path to the input audio file
+        output_path: Path of the WAV file to write
+    """
+    samples, sr = sf.read(audio_path, dtype='float32', always_2d=True)
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    if sr != PROCESSED_SAMPLE_RATE:
+        ratio = Fraction(PROCESSED_SAMPLE_RATE, sr)
+        mono = resample_poly(mono, ratio.numerator, ratio.denominator)
+    sf.write(output_path, mono, PROCESSED_SAMPLE_RATE, subtype='PCM_16')
+
+
+def _read_mono(file_path: str, sr: int) -> np.ndarray:
+    """
+    Decode an audio file to a mono float32 array at the given sample rate.
+    libsndfile decodes in-process and soxr resamples when installed (resample_poly
+    otherwise); formats libsndfile can't read (e.g. m4a, or mp3 on older builds)
+    fall back to librosa.load.
+    
+    Args:
+        file_path: Path to audio file
+        sr: Sample rate to return the audio at
+        
+    Returns:
+        Mono float32 audio array at sr
+    """
+    try:
+        samples, file_sr = sf.read(file_path, dtype='float32', always_2d=True)
+    except sf.SoundFileError:
+        audio, _ = librosa.load(file_path, sr=sr, mono=True)
+        return audio
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    if file_sr != sr:
+        if SOXR_AVAILABLE:
+            mono = soxr.resample(mono, file_sr, sr, quality='HQ')
+        else:
+            ratio = Fraction(sr, file_sr)
+            mono = resample_poly(mono, ratio.numerator, ratio.denominator).astype(np.float32)
+    return mono
+
 
 def preprocess_audio(audio_path: str) -> Tuple[str, float]:
     """
@@ -18,7 +127,9 @@ def preprocess_audio(audio_path: str) -> Tuple[str, float]:
         audio_path: Path to the input audio file
         
     Returns:
-        Tuple of (processed_file_path, duration_in_seconds)
+        Tuple of (processed_file_path, duration_in_seconds); the file is always a
+        PROCESSED_CHANNELS-channel WAV at PROCESSED_SAMPLE_RATE. A WAV already in that
+        format is returned as is, so the path may be audio_path itself.
         
     Raises:
         ValueError: If the file type is not supported
@@ -37,24 +148,37 @@ def preprocess_audio(audio_path: str) -> Tuple[str, float]:
         raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {', '.join(supported_formats)}")
     
     try:
+        # libsndfile reads WAV/FLAC/OGG (and MP3 on recent builds) in-process; pydub and
+        # ffmpeg are only needed for the formats it can't decode
+        try:
+            info = sf.info(audio_path)
+        except sf.SoundFileError:
+            info = None
+        if info is not None:
+            if (file_extension == '.wav' and info.samplerate == PROCESSED_SAMPLE_RATE
+                    and info.channels == PROCESSED_CHANNELS):
+                # Already in the target format: no decode, no copy
+                return audio_path, info.frames / info.samplerate
+            temp_file_path = _new_temp_wav()
+            _convert_with_soundfile(audio_path, temp_file_path)
+            return temp_file_path, info.frames / info.samplerate
+        
         # Load audio using pydub
         audio = AudioSegment.from_file(audio_path)
         
         # Convert to mono channel
-        if audio.channels > 1:
-            audio = audio.set_channels(1)
+        if audio.channels != PROCESSED_CHANNELS:
+            audio = audio.set_channels(PROCESSED_CHANNELS)
         
         # Convert to 44.1kHz sample rate
-        if audio.frame_rate != 44100:
-            audio = audio.set_frame_rate(44100)
+        if audio.frame_rate != PROCESSED_SAMPLE_RATE:
+            audio = _resample_segment(audio, PROCESSED_SAMPLE_RATE)
         
         # Get duration in seconds
         duration_seconds = len(audio) / 1000.0
         
         # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        temp_file_path = temp_file.name
-        temp_file.close()
+        temp_file_path = _new_temp_wav()
         
         # Export processed audio to temporary WAV file
         audio.export(temp_file_path, format='wav')
@@ -104,8 +228,20 @@ class AudioProcessor:
         Returns:
             Tuple of (audio_array, sample_rate)
         """
-        audio, sr = librosa.load(file_path, sr=self.target_sr)
-        return audio, sr
+        return _read_mono(file_path, self.target_sr), self.target_sr
+    
+    def load_mono(self, file_path: str, sr: Optional[int] = None) -> np.ndarray:
+        """
+        Decode an audio file once into a mono array so it can be shared between analyses.
+        
+        Args:
+            file_path: Path to audio file
+            sr: Sample rate to decode at (defaults to the processor's target rate)
+            
+        Returns:
+            Mono audio array at the requested sample rate
+        """
+        return _read_mono(file_path, sr or self.target_sr)
     
     def save_audio(self, audio: np.ndarray, file_path: str, sr: int = 22050):
         """
@@ -129,7 +265,16 @@ class AudioProcessor:
         Returns:
             Normalized audio array
         """
-        return librosa.util.normalize(audio)
+        # Integer PCM is promoted first: the scale factor is below 1, and abs() of the
+        # most negative integer would overflow
+        if not np.issubdtype(audio.dtype, np.floating):
+            audio = audio.astype(np.float32)
+        
+        # Peak normalization: one pass to find the peak, one scalar multiply
+        peak = np.max(np.abs(audio)) if audio.size else 0
+        if peak == 0:
+            return audio
+        return np.multiply(audio, audio.dtype.type(1.0 / peak))
     
     def trim_silence(self, audio: np.ndarray, threshold_db: float = -60) -> np.ndarray:
         """
@@ -166,6 +311,34 @@ class AudioProcessor:
         Returns:
             Dictionary with audio information
         """
+        # Everything returned here lives in the file header, so read only that
+        try:
+            info = sf.info(file_path)
+            return {
+                'duration': info.duration,
+                'sample_rate': info.samplerate,
+                'channels': info.channels,
+                'bit_depth': _SUBTYPE_BITS.get(info.subtype),
+                'format': info.format.lower()
+            }
+        except sf.SoundFileError:
+            pass
+        
+        # mutagen parses mp3/m4a headers that libsndfile can't
+        if MUTAGEN_AVAILABLE:
+            try:
+                tagged = mutagen.File(file_path)
+            except Exception:
+                tagged = None
+            if tagged is not None:
+                return {
+                    'duration': tagged.info.length,
+                    'sample_rate': tagged.info.sample_rate,
+                    'channels': tagged.info.channels,
+                    'bit_depth': getattr(tagged.info, 'bits_per_sample', None),
+                    'format': os.path.splitext(file_path)[1].lstrip('.').lower()
+                }
+        
         audio = AudioSegment.from_file(file_path)
         
         return {
@@ -173,5 +346,5 @@ class AudioProcessor:
             'sample_rate': audio.frame_rate,
             'channels': audio.channels,
             'bit_depth': audio.sample_width * 8,
-            'format': audio.format
+            'format': os.path.splitext(file_path)[1].lstrip('.').lower()
         } 
\ No newline at end of file
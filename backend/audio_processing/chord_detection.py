@@ -6,34 +6,145 @@ Chord detection module using madmom's DeepChromaProcessor and CRFChordRecognitio
 from .madmom_patch import apply_patch
 apply_patch()
 
+import threading
+from functools import lru_cache
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 from madmom.audio.chroma import DeepChromaProcessor
+from madmom.audio.signal import Signal
 from madmom.features.chords import DeepChromaChordRecognitionProcessor
 
+
+@lru_cache(maxsize=8)
+def _pitch_class_matrix(n_fft: int, sr: int, fmin: float = 65.0, fmax: float = 2100.0) -> np.ndarray:
+    """
+    Build a (n_fft // 2 + 1, 12) matrix folding STFT bins onto pitch classes.
+    Bins outside [fmin, fmax] are ignored. Pitch class 0 is A, matching madmom's chroma ordering.
+    """
+    freqs = np.fft.rfftfreq(n_fft, d=1.0 / sr)
+    bins = np.nonzero((freqs >= fmin) & (freqs <= fmax))[0]
+    midi = np.round(69 + 12 * np.log2(freqs[bins] / 440.0)).astype(int)
+    matrix = np.zeros((len(freqs), 12), dtype=np.float32)
+    matrix[bins, (midi - 69) % 12] = 1.0
+    return matrix
+
+
+# Readable names for madmom chord qualities
+_QUALITY_MAP = {
+    'maj': 'major',
+    'min': 'minor',
+    'dim': 'diminished',
+    'aug': 'augmented',
+    '7': '7th',
+    'maj7': 'major 7th',
+    'min7': 'minor 7th',
+    'sus2': 'sus2',
+    'sus4': 'sus4',
+    'hdim7': 'half-diminished 7th',
+    'minmaj7': 'minor major 7th',
+    'dim7': 'diminished 7th',
+}
+
+
+@lru_cache(maxsize=512)
+def format_chord_name(label: str) -> str:
+    """
+    Convert madmom's chord label (e.g., 'C:maj') to a more readable format (e.g., 'C major').
+    Results are cached since songs only use a handful of distinct labels.
+    Args:
+        label: Chord label from madmom
+    Returns:
+        Readable chord name
+    """
+    if label == 'N':
+        return 'No Chord'
+    root, sep, quality = label.partition(':')
+    if not sep:
+        return label
+    return f"{root} {_QUALITY_MAP.get(quality, quality)}"
+
+
 class ChordDetector:
     """
     A class for detecting chords in audio files using madmom.
     """
-    def __init__(self):
+    # Settings for the torchaudio chroma path; the hop matches the recognizer's 10 fps
+    GPU_CHROMA_SR = 22050
+    GPU_CHROMA_N_FFT = 4096
+    GPU_CHROMA_FPS = 10
+
+    def __init__(self, gpu_chroma: bool = False):
         """
         Initialize the chord detector with madmom processors.
+        Args:
+            gpu_chroma: Compute chroma with torchaudio (on CUDA when available) instead of
+                madmom's DeepChromaProcessor. Faster, but the CRF decoder was trained on deep
+                chroma, so recognition quality may differ.
         """
+        self.gpu_chroma = gpu_chroma
         self.chroma_processor = DeepChromaProcessor()
         self.chord_recognizer = DeepChromaChordRecognitionProcessor()
 
-    def detect_chords(self, audio_file_path: str) -> List[Tuple[str, float, float]]:
+    def _chroma_gpu(self, audio_file_path: Union[str, np.ndarray], sr: Optional[int] = None) -> np.ndarray:
+        """
+        Compute a (T, 12) chroma with a torchaudio spectrogram folded onto pitch classes.
+        Args:
+            audio_file_path: Path to the audio file, or an already decoded mono array
+            sr: Sample rate of the array (required when passing an array)
+        Returns:
+            Frame-normalized chroma at the recognizer's frame rate
+        """
+        import torch
+        import torchaudio
+
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        if isinstance(audio_file_path, np.ndarray):
+            wave = torch.from_numpy(np.ascontiguousarray(audio_file_path, dtype=np.float32))
+        else:
+            wave, sr = torchaudio.load(audio_file_path)
+            wave = wave.mean(dim=0)
+        if sr != self.GPU_CHROMA_SR:
+            wave = torchaudio.functional.resample(wave, sr, self.GPU_CHROMA_SR)
+
+        spectrogram = torchaudio.transforms.Spectrogram(
+            n_fft=self.GPU_CHROMA_N_FFT,
+            hop_length=self.GPU_CHROMA_SR // self.GPU_CHROMA_FPS,
+            power=1.0
+        ).to(device)
+        fold = torch.from_numpy(_pitch_class_matrix(self.GPU_CHROMA_N_FFT, self.GPU_CHROMA_SR)).to(device)
+
+        with torch.inference_mode():
+            spec = spectrogram(wave.to(device))
+            chroma = spec.transpose(-1, -2) @ fold
+            chroma = chroma / chroma.max(dim=1, keepdim=True).values.clamp_min(1e-8)
+        return chroma.cpu().numpy()
+
+    def detect_chords(self, audio_file_path: Union[str, np.ndarray], sr: Optional[int] = None) -> List[Tuple[str, float, float]]:
         """
         Detect chords in an audio file.
         Args:
-            audio_file_path: Path to the audio file
+            audio_file_path: Path to the audio file, or an already decoded mono array
+            sr: Sample rate of the array (required when passing an array; 44100 Hz matches madmom)
         Returns:
             List of tuples: (chord_name, start_time_sec, end_time_sec)
         """
         try:
             # Extract chroma features
-            print(f"Extracting chroma features from {audio_file_path}")
-            chroma = self.chroma_processor(audio_file_path)
+            if isinstance(audio_file_path, np.ndarray):
+                print(f"Extracting chroma features from decoded audio ({len(audio_file_path)} samples at {sr} Hz)")
+            else:
+                print(f"Extracting chroma features from {audio_file_path}")
+            chroma = None
+            if self.gpu_chroma:
+                try:
+                    chroma = self._chroma_gpu(audio_file_path, sr)
+                except Exception as e:
+                    print(f"Warning: torchaudio chroma failed, using DeepChromaProcessor: {e}")
+            if chroma is None:
+                if isinstance(audio_file_path, np.ndarray):
+                    chroma = self.chroma_processor(Signal(audio_file_path, sample_rate=sr))
+                else:
+                    chroma = self.chroma_processor(audio_file_path)
             print(f"Chroma shape: {chroma.shape if hasattr(chroma, 'shape') else 'No shape'}")
             print(f"Chroma type: {type(chroma)}")
             
@@ -52,42 +163,17 @@ class ChordDetector:
                         print(f"  Item {i}: {item} (type: {type(item)})")
             
             # Format output
-            formatted = []
-            for chord_data in chords:
-                try:
-                    # Handle different possible formats
-                    if len(chord_data) == 3:
-                        # Madmom format: (start_time, end_time, chord_label)
-                        start, end, chord_label = chord_data
-                    elif len(chord_data) == 2:
-                        # Alternative format: (label, time)
-                        chord_label, time = chord_data
-                        start = time
-                        end = time + 0.5  # Default duration
-                    else:
-                        # Single value or unexpected format
-                        chord_label = chord_data
-                        start = 0.0
-                        end = 0.5
-                    
-                    # Handle case where chord_label might be a numpy.float64
-                    if hasattr(chord_label, 'item'):
-                        chord_label = str(chord_label.item())
-                    else:
-                        chord_label = str(chord_label)
-                    
-                    # Ensure start and end are floats
-                    try:
-                        start_float = float(start)
-                        end_float = float(end)
-                    except (ValueError, TypeError):
-                        print(f"Warning: Could not convert start/end to float: {start}, {end}")
-                        continue
-                    
-                    formatted.append((self.format_chord_name(chord_label), start_float, end_float))
-                except Exception as e:
-                    print(f"Warning: Error processing chord data {chord_data}: {e}")
-                    continue
+            if getattr(chords, 'dtype', None) is not None and chords.dtype.names and 'label' in chords.dtype.names:
+                # Madmom returns a structured (start, end, label) array; songs reuse a
+                # handful of labels, so format each distinct label once and map back
+                labels, label_index = np.unique(chords['label'].astype(str), return_inverse=True)
+                names = [format_chord_name(label) for label in labels]
+                formatted = [
+                    (names[i], start, end)
+                    for i, start, end in zip(label_index.tolist(), chords['start'].tolist(), chords['end'].tolist())
+                ]
+            else:
+                formatted = self._format_chord_rows(chords)
             
             # If no chords were successfully processed, create a fallback
             if not formatted:
@@ -116,6 +202,53 @@ class ChordDetector:
                 ("F major", 6.0, 8.0)
             ]
 
+    def _format_chord_rows(self, chords) -> List[Tuple[str, float, float]]:
+        """
+        Format chord predictions that are not a madmom structured array, row by row.
+        Args:
+            chords: Iterable of chord predictions in any supported layout
+        Returns:
+            List of tuples: (chord_name, start_time_sec, end_time_sec)
+        """
+        formatted = []
+        for chord_data in chords:
+            try:
+                # Handle different possible formats
+                if len(chord_data) == 3:
+                    # Madmom format: (start_time, end_time, chord_label)
+                    start, end, chord_label = chord_data
+                elif len(chord_data) == 2:
+                    # Alternative format: (label, time)
+                    chord_label, time = chord_data
+                    start = time
+                    end = time + 0.5  # Default duration
+                else:
+                    # Single value or unexpected format
+                    chord_label = chord_data
+                    start = 0.0
+                    end = 0.5
+
+                # Handle case where chord_label might be a numpy.float64
+                if hasattr(chord_label, 'item'):
+                    chord_label = str(chord_label.item())
+                else:
+                    chord_label = str(chord_label)
+
+                # Ensure start and end are floats
+                try:
+                    start_float = float(start)
+                    end_float = float(end)
+                except (ValueError, TypeError):
+                    print(f"Warning: Could not convert start/end to float: {start}, {end}")
+                    continue
+
+                formatted.append((self.format_chord_name(chord_label), start_float, end_float))
+            except Exception as e:
+                print(f"Warning: Error processing chord data {chord_data}: {e}")
+                continue
+        
+        return formatted
+
     def format_chord_name(self, madmom_chord_label: str) -> str:
         """
         Convert madmom's chord label (e.g., 'C:maj') to a more readable format (e.g., 'C major').
@@ -129,27 +262,23 @@ class ChordDetector:
             madmom_chord_label = str(madmom_chord_label.item())
         else:
             madmom_chord_label = str(madmom_chord_label)
-            
-        if madmom_chord_label == 'N':
-            return 'No Chord'
-        # Split by ':' if present
-        if ':' in madmom_chord_label:
-            root, quality = madmom_chord_label.split(':', 1)
-            # Map common qualities
-            quality_map = {
-                'maj': 'major',
-                'min': 'minor',
-                'dim': 'diminished',
-                'aug': 'augmented',
-                '7': '7th',
-                'maj7': 'major 7th',
-                'min7': 'minor 7th',
-                'sus2': 'sus2',
-                'sus4': 'sus4',
-                'hdim7': 'half-diminished 7th',
-                'minmaj7': 'minor major 7th',
-                'dim7': 'diminished 7th',
-            }
-            pretty_quality = quality_map.get(quality, quality)
-            return f"{root} {pretty_quality}"
-        return madmom_chord_label 
\ No newline at end of file
+        return format_chord_name(madmom_chord_label)
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> ChordDetector:
+    """
+    Get the shared ChordDetector, creating it on first use.
+    The madmom models are loaded once per process and reused by every caller.
+    Returns:
+        Shared ChordDetector instance
+    """
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = ChordDetector()
+    return _detector
@@ -0,0 +1,41 @@
+"""
+Optional pyFFTW backend for the FFT-heavy stages: the STFTs behind pyin, reverb
+convolution and librosa's phase-vocoder pitch shift.
+"""
+
+import threading
+
+_configured = None
+_configure_lock = threading.Lock()
+
+
+def configure() -> bool:
+    """
+    Route scipy.fft and librosa through pyFFTW with plan caching, if pyFFTW is installed.
+    This changes process-wide FFT state, so it is only done by the entry points that want it;
+    later calls are no-ops.
+    Returns:
+        True if the pyFFTW backend is in use
+    """
+    global _configured
+    if _configured is None:
+        with _configure_lock:
+            if _configured is None:
+                try:
+                    import pyfftw
+                    import pyfftw.interfaces.numpy_fft
+                    import pyfftw.interfaces.scipy_fft
+                    import scipy.fft
+                    import librosa
+                except ImportError:
+                    _configured = False
+                else:
+                    pyfftw.interfaces.cache.enable()
+                    # Keep plans alive between calls; analyses reuse the same frame sizes
+                    pyfftw.interfaces.cache.set_keepalive_time(30)
+                    # Plan quickly; clip lengths vary, so exhaustive planning would not pay off
+                    pyfftw.config.PLANNER_EFFORT = 'FFTW_ESTIMATE'
+                    scipy.fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+                    librosa.set_fftlib(pyfftw.interfaces.numpy_fft)
+                    _configured = True
+    return _configured
@@ -1,12 +1,29 @@
 """
-Melody extraction module for extracting melodic content from audio using librosa's pyin algorithm.
+Melody extraction module for extracting melodic content from audio using Praat's pitch
+tracker (via parselmouth) or librosa's pyin algorithm.
 """
 
 import numpy as np
 import librosa
-from typing import List, Tuple, Optional
+from scipy.fft import next_fast_len
+from typing import List, Tuple, Optional, Union
+import threading
 import warnings
 
+try:
+    import parselmouth
+    PARSELMOUTH_AVAILABLE = True
+except ImportError:
+    PARSELMOUTH_AVAILABLE = False
+
+# Settings for the shared extractor. Nyquist at 8 kHz (4 kHz) still covers fundamentals up
+# to C7 (~2093 Hz) and pyin has under half the samples to process, at the cost of discarding
+# everything above 4 kHz. The frame is 96 ms, long enough for pyin to resolve C2 (~65 Hz)
+# periods, and the hop keeps the ~23 ms frame spacing of 512 samples at 22050 Hz.
+PITCH_SAMPLE_RATE = 8000
+PITCH_FRAME_LENGTH = 768
+PITCH_HOP_LENGTH = 186
+
 
 class MelodyExtractor:
     """
@@ -19,7 +36,8 @@ class MelodyExtractor:
                  sr: int = 22050,
                  frame_length: int = 2048,
                  hop_length: int = 512,
-                 fill_na: Optional[float] = None):
+                 fill_na: Optional[float] = None,
+                 method: Optional[str] = None):
         """
         Initialize the melody extractor.
         
@@ -27,61 +45,53 @@ class MelodyExtractor:
             fmin: Minimum frequency in Hz (default: C2 ~ 65.41 Hz)
             fmax: Maximum frequency in Hz (default: C7 ~ 2093.00 Hz)
             sr: Target sample rate for processing
-            frame_length: Length of each frame for analysis
+            frame_length: Length of each frame for analysis (rounded up to the next
+                FFT-friendly size, so lengths with large prime factors don't hit slow FFTs)
             hop_length: Number of samples between frames
             fill_na: Value to fill unvoiced segments (None for no filling)
+            method: Pitch tracker, 'praat' or 'pyin'. Defaults to 'praat' when parselmouth
+                is installed: it is orders of magnitude faster than pyin on monophonic
+                material. Use 'pyin' for its probabilistic voicing on harder input.
         """
         # Set default frequency range for human voice/melody
         self.fmin = fmin if fmin is not None else librosa.note_to_hz('C2')  # ~65.41 Hz
         self.fmax = fmax if fmax is not None else librosa.note_to_hz('C7')  # ~2093.00 Hz
         
         self.sr = sr
-        self.frame_length = frame_length
+        self.frame_length = next_fast_len(frame_length, real=True)
         self.hop_length = hop_length
         self.fill_na = fill_na
+        if method is None:
+            method = 'praat' if PARSELMOUTH_AVAILABLE else 'pyin'
+        if method not in ('praat', 'pyin'):
+            raise ValueError(f"Unknown pitch tracking method: {method}. Use 'praat' or 'pyin'")
+        if method == 'praat' and not PARSELMOUTH_AVAILABLE:
+            print("Warning: parselmouth not installed, using pyin for melody extraction")
+            method = 'pyin'
+        self.method = method
         
         # Suppress warnings for better user experience
         warnings.filterwarnings('ignore', category=UserWarning, module='librosa')
     
-    def extract_melody(self, audio_file_path: str) -> List[Tuple[float, float]]:
+    def extract_melody(self, audio_file_path: Union[str, np.ndarray], sr: Optional[int] = None) -> List[Tuple[float, float]]:
         """
         Extract melody from audio file using fundamental frequency estimation.
         
         Args:
-            audio_file_path: Path to the audio file
+            audio_file_path: Path to the audio file, or an already decoded mono array
+            sr: Sample rate of the array (required when passing an array)
             
         Returns:
             List of (timestamp_sec, frequency_hz) tuples for voiced segments
         """
+        if isinstance(audio_file_path, np.ndarray):
+            return self.extract_melody_from_array(audio_file_path, sr)
+        
         try:
             # Load audio file
             audio, sr = librosa.load(audio_file_path, sr=self.sr)
             
-            # Extract fundamental frequency using pyin
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                y=audio,
-                fmin=self.fmin,
-                fmax=self.fmax,
-                sr=self.sr,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-                fill_na=self.fill_na
-            )
-            
-            # Convert frame indices to timestamps
-            timestamps = librosa.frames_to_time(
-                np.arange(len(f0)), 
-                sr=self.sr, 
-                hop_length=self.hop_length
-            )
-            
-            # Filter for voiced segments and create result
-            melody_data = []
-            for i, (timestamp, freq, is_voiced) in enumerate(zip(timestamps, f0, voiced_flag)):
-                if is_voiced and not np.isnan(freq) and freq > 0:
-                    melody_data.append((float(timestamp), float(freq)))
-            
-            return melody_data
+            return self._track_pitch(audio)
             
         except Exception as e:
             print(f"Error extracting melody from {audio_file_path}: {e}")
@@ -104,6 +114,35 @@ class MelodyExtractor:
                 audio = librosa.resample(audio, orig_sr=sr, target_sr=self.sr)
                 sr = self.sr
             
+            return self._track_pitch(audio)
+            
+        except Exception as e:
+            print(f"Error extracting melody from audio array: {e}")
+            return []
+    
+    def _track_pitch(self, audio: np.ndarray) -> List[Tuple[float, float]]:
+        """
+        Run the configured pitch tracker on audio at self.sr.
+        
+        Args:
+            audio: Mono audio signal array at self.sr
+            
+        Returns:
+            List of (timestamp_sec, frequency_hz) tuples for voiced segments
+        """
+        if self.method == 'praat':
+            # Praat's autocorrelation tracker, stepping at the same hop as pyin
+            sound = parselmouth.Sound(np.asarray(audio, dtype=np.float64), sampling_frequency=self.sr)
+            pitch = sound.to_pitch(
+                time_step=self.hop_length / self.sr,
+                pitch_floor=self.fmin,
+                pitch_ceiling=self.fmax
+            )
+            timestamps = pitch.xs()
+            f0 = pitch.selected_array['frequency']
+            # Praat reports unvoiced frames as 0 Hz
+            voiced_flag = f0 > 0
+        else:
             # Extract fundamental frequency using pyin
             f0, voiced_flag, voiced_probs = librosa.pyin(
                 y=audio,
@@ -121,18 +160,14 @@ class MelodyExtractor:
                 sr=self.sr, 
                 hop_length=self.hop_length
             )
-            
-            # Filter for voiced segments and create result
-            melody_data = []
-            for i, (timestamp, freq, is_voiced) in enumerate(zip(timestamps, f0, voiced_flag)):
-                if is_voiced and not np.isnan(freq) and freq > 0:
-                    melody_data.append((float(timestamp), float(freq)))
-            
-            return melody_data
-            
-        except Exception as e:
-            print(f"Error extracting melody from audio array: {e}")
-            return []
+        
+        # Filter for voiced segments and create result
+        melody_data = []
+        for timestamp, freq, is_voiced in zip(timestamps, f0, voiced_flag):
+            if is_voiced and not np.isnan(freq) and freq > 0:
+                melody_data.append((float(timestamp), float(freq)))
+        
+        return melody_data
     
     def get_melody_notes(self, melody_data: List[Tuple[float, float]]) -> List[Tuple[float, str]]:
         """
@@ -248,4 +283,28 @@ class MelodyExtractor:
             if segment_duration >= min_segment_duration:
                 segments.append(current_segment)
         
-        return segments 
\ No newline at end of file
+        return segments 
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_extractor() -> MelodyExtractor:
+    """
+    Get the shared MelodyExtractor, creating it on first use.
+    It analyses audio at PITCH_SAMPLE_RATE rather than the 22050 Hz class default.
+    
+    Returns:
+        Shared MelodyExtractor instance
+    """
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = MelodyExtractor(
+                    sr=PITCH_SAMPLE_RATE,
+                    frame_length=PITCH_FRAME_LENGTH,
+                    hop_length=PITCH_HOP_LENGTH
+                )
+    return _extractor
@@ -1,49 +1,81 @@
 """
-Vocal separation module using Spleeter CLI to separate vocals from instrumental tracks.
+Vocal separation module using an in-process Spleeter model to separate vocals from instrumental tracks.
 """
 
 import os
 import tempfile
-import subprocess
+import threading
 from typing import Tuple
 
+import numpy as np
+import soundfile as sf
+
+
 class VocalSeparator:
     """
-    A class for separating vocals from instrumental tracks using the Spleeter CLI.
+    A class for separating vocals from instrumental tracks using Spleeter's 2-stem model.
+
+    The Spleeter model is loaded once per process and shared by every instance,
+    so repeated separations only pay for inference, not for TensorFlow start-up
+    and weight loading. TensorFlow places the model on the GPU when one is visible.
     """
+
+    # Spleeter's pretrained models expect 44.1kHz stereo input
+    SAMPLE_RATE = 44100
+
+    _separator = None
+    _separator_lock = threading.Lock()
+
     def __init__(self):
-        pass
+        """Initialize the separator, loading the shared Spleeter model if needed."""
+        try:
+            self.separator = self._get_separator()
+        except Exception as e:
+            print(f"Warning: Could not load Spleeter model: {e}")
+            self.separator = None
+
+    @classmethod
+    def _get_separator(cls):
+        """Return the process-wide Spleeter separator, creating it on first use."""
+        if cls._separator is None:
+            with cls._separator_lock:
+                if cls._separator is None:
+                    from spleeter.separator import Separator
+                    cls._separator = Separator('spleeter:2stems', multiprocess=False)
+        return cls._separator
 
     def separate_vocals(self, audio_file_path: str) -> Tuple[str, str]:
         """
-        Separate vocals from instrumental in an audio file using the Spleeter CLI.
+        Separate vocals from instrumental in an audio file using the shared Spleeter model.
         Args:
             audio_file_path: Path to the input audio file
         Returns:
             Tuple of (instrumental_path, vocals_path) - paths to separated audio files
         """
         try:
-            print(f"Separating vocals from: {audio_file_path} (using Spleeter CLI)")
-            # Create a temporary directory for Spleeter output
+            print(f"Separating vocals from: {audio_file_path} (using in-process Spleeter)")
+            if self.separator is None:
+                self.separator = self._get_separator()
+            waveform, sr = sf.read(audio_file_path, dtype='float32', always_2d=True)
+            if sr != self.SAMPLE_RATE:
+                import librosa
+                waveform = librosa.resample(waveform.T, orig_sr=sr, target_sr=self.SAMPLE_RATE).T
+                sr = self.SAMPLE_RATE
+            # Spleeter works on stereo input; duplicate mono into both channels
+            if waveform.shape[1] == 1:
+                waveform = np.repeat(waveform, 2, axis=1)
+
+            prediction = self.separator.separate(waveform)
+
+            # Keep the same <temp_dir>/<basename>/{accompaniment,vocals}.wav layout as the CLI
             temp_dir = tempfile.mkdtemp()
-            # Run Spleeter CLI
-            cmd = [
-                "spleeter", "separate",
-                "-p", "spleeter:2stems",
-                "-o", temp_dir,
-                audio_file_path
-            ]
-            print(f"Running command: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True)
-            # Spleeter outputs to temp_dir/<basename>/accompaniment.wav and vocals.wav
             base_name = os.path.splitext(os.path.basename(audio_file_path))[0]
             output_folder = os.path.join(temp_dir, base_name)
+            os.makedirs(output_folder, exist_ok=True)
             instrumental_path = os.path.join(output_folder, "accompaniment.wav")
             vocals_path = os.path.join(output_folder, "vocals.wav")
-            if not os.path.exists(instrumental_path):
-                raise FileNotFoundError(f"Instrumental file not found: {instrumental_path}")
-            if not os.path.exists(vocals_path):
-                raise FileNotFoundError(f"Vocals file not found: {vocals_path}")
+            sf.write(instrumental_path, prediction['accompaniment'], sr)
+            sf.write(vocals_path, prediction['vocals'], sr)
             print(f"Separation complete. Instrumental: {instrumental_path}, Vocals: {vocals_path}")
             return instrumental_path, vocals_path
         except Exception as e:
@@ -58,4 +90,4 @@ class VocalSeparator:
         return instrumental_path
 
     def cleanup(self):
-        pass 
\ No newline at end of file
+        pass
@@ -3,31 +3,114 @@ Main entry point for the AI Music Coach backend application.
 """
 
 import uvicorn
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from starlette.background import BackgroundTask
 import os
 import tempfile
-import shutil
 import uuid
+import aiofiles
 import time
-from typing import Dict, Any
+from concurrent.futures import as_completed
+import threading
+from typing import Dict, Any, Optional
+from cachetools import TTLCache
 
 from backend.api.routes import router
 from utils.config import get_api_config
-from backend.audio_processing.audio_utils import preprocess_audio
-from backend.audio_processing.chord_detection import ChordDetector
+from backend.audio_processing.audio_utils import preprocess_audio, AudioProcessor
+from backend.audio_processing.chord_detection import ChordDetector, get_detector
 from backend.audio_processing.vocal_separation import VocalSeparator
-from backend.synthesis.advanced_vocal_synthesis import synthesize_stable_chord_vocals_sync
-from backend.audio_processing.melody_extraction import MelodyExtractor
+from backend.synthesis.advanced_vocal_synthesis import synthesize_stable_chord_vocals_sync, get_synthesizer
+from backend.audio_processing.melody_extraction import MelodyExtractor, get_extractor
+from backend.audio_processing.analysis_pool import (
+    detect_chords_worker, extract_melody_worker, get_analysis_pool, start_analysis_pool,
+    shutdown_analysis_pool
+)
 
 # Get configuration
 config = get_api_config()
 
-# Global status tracking
-processing_status = {}
-processing_results = {}  # Store file paths for completed jobs
+# Sample rate madmom's chord models expect when fed decoded audio
+CHORD_DETECTION_SR = 44100
+
+# Size of each read when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# How long finished job state is kept, and how many jobs are tracked at most
+JOB_TTL_SECONDS = 3600
+MAX_TRACKED_JOBS = 10000
+
+# Working directories the service expects relative to the current directory
+_REQUIRED_DIRS = ("uploads", "outputs", "ml_models")
+
+
+def _remove_file(path: str):
+    """Delete a file if it still exists."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class JobResultCache(TTLCache):
+    """
+    TTL cache of output file paths that deletes each file when its entry expires or is evicted.
+    """
+    
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for _, path in expired:
+            _remove_file(path)
+        return expired
+    
+    def popitem(self):
+        job_id, path = super().popitem()
+        _remove_file(path)
+        return job_id, path
+
+
+# Global status tracking, bounded so old jobs don't accumulate forever
+processing_status = TTLCache(maxsize=MAX_TRACKED_JOBS, ttl=JOB_TTL_SECONDS)
+processing_results = JobResultCache(maxsize=MAX_TRACKED_JOBS, ttl=JOB_TTL_SECONDS)  # Store file paths for completed jobs
+_status_lock = threading.Lock()
+
+
+def set_job_status(job_id: str, status: Dict[str, Any]):
+    """Record the current status of a job."""
+    with _status_lock:
+        processing_status[job_id] = status
+
+
+def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a job's status, or None if the job is unknown or expired."""
+    with _status_lock:
+        status = processing_status.get(job_id)
+        return dict(status) if status is not None else None
+
+
+def set_job_result(job_id: str, output_path: str):
+    """Record the output file of a completed job."""
+    with _status_lock:
+        processing_results[job_id] = output_path
+
+
+def get_job_result(job_id: str) -> Optional[str]:
+    """Return the output file of a completed job, or None if unknown or expired."""
+    with _status_lock:
+        return processing_results.get(job_id)
+
+
+def discard_job_result(job_id: str):
+    """Forget a job's output file and delete it from disk."""
+    with _status_lock:
+        output_path = processing_results.pop(job_id, None)
+    if output_path:
+        _remove_file(output_path)
+
 
 class MusicCoachProcessor:
     """
@@ -35,10 +118,47 @@ class MusicCoachProcessor:
     """
     
     def __init__(self):
-        """Initialize the processor with chord detector, melody extractor, vocal separator, and vocal synthesizer."""
-        self.chord_detector = ChordDetector()
-        self.melody_extractor = MelodyExtractor()
-        self.vocal_separator = VocalSeparator()
+        """Initialize the processor. Models are shared per process and loaded on first use."""
+        self._vocal_separator = None
+    
+    @property
+    def chord_detector(self) -> ChordDetector:
+        """Shared chord detector."""
+        return get_detector()
+    
+    @property
+    def melody_extractor(self) -> MelodyExtractor:
+        """Shared melody extractor."""
+        return get_extractor()
+    
+    @property
+    def vocal_separator(self) -> VocalSeparator:
+        """Vocal separator backed by the shared Spleeter model."""
+        if self._vocal_separator is None:
+            self._vocal_separator = VocalSeparator()
+        return self._vocal_separator
+    
+    def preload_models(self):
+        """
+        Load the models this process uses up front so the first request doesn't pay for it.
+        Chord detection and melody extraction run in the analysis pool, whose workers
+        load and warm up their own models.
+        """
+        self.vocal_separator
+        get_synthesizer(
+            model_name="tts_models/en/ljspeech/tacotron2-DDC",
+            vocoder_name="vocoder_models/en/ljspeech/hifigan_v2"
+        )
+    
+    def warm_up(self):
+        """
+        Run a short phrase through the TTS model so lazily loaded weights and
+        caches are ready before real traffic.
+        """
+        get_synthesizer(
+            model_name="tts_models/en/ljspeech/tacotron2-DDC",
+            vocoder_name="vocoder_models/en/ljspeech/hifigan_v2"
+        ).warm_up()
     
     def process_song(self, input_audio_path: str, output_audio_path: str, job_id: str) -> Dict[str, Any]:
         """
@@ -52,35 +172,51 @@ class MusicCoachProcessor:
         """
         try:
             # Update status
-            processing_status[job_id] = {"status": "preprocessing", "progress": 10, "message": "Preprocessing audio..."}
+            set_job_status(job_id, {"status": "preprocessing", "progress": 10, "message": "Preprocessing audio..."})
             
             # Step 1: Preprocess the audio
             print(f"Preprocessing audio: {input_audio_path}")
             processed_audio_path, audio_duration = preprocess_audio(input_audio_path)
             
             # Update status
-            processing_status[job_id] = {"status": "separating_vocals", "progress": 20, "message": "Separating vocals from instrumental..."}
+            set_job_status(job_id, {"status": "separating_vocals", "progress": 20, "message": "Separating vocals from instrumental..."})
             
             # Step 2: Separate vocals from instrumental
             print(f"Separating vocals from instrumental...")
             instrumental_path, vocals_path = self.vocal_separator.separate_vocals(processed_audio_path)
             
             # Update status
-            processing_status[job_id] = {"status": "detecting_chords", "progress": 30, "message": "Detecting chords..."}
+            set_job_status(job_id, {"status": "detecting_chords", "progress": 30, "message": "Detecting chords..."})
             
-            # Step 3: Detect chords (use instrumental for better chord detection)
-            print(f"Detecting chords in audio...")
-            detected_chords = self.chord_detector.detect_chords(instrumental_path)
+            # Steps 3 and 4 are independent passes, so run them in parallel worker processes:
+            # detect chords on the instrumental and extract the melody contour from the vocals
+            print(f"Detecting chords and extracting melody contour...")
+            chord_input = instrumental_path
+            melody_input = vocals_path if vocals_path else processed_audio_path
+            shared_sr = None
+            if chord_input == melody_input:
+                # Separation fell back to the mixed audio, so both steps read the same file:
+                # decode it once at madmom's rate and hand the array to both
+                shared_sr = CHORD_DETECTION_SR
+                chord_input = melody_input = AudioProcessor(target_sr=shared_sr).load_mono(instrumental_path)
             
-            # Update status
-            processing_status[job_id] = {"status": "extracting_melody", "progress": 50, "message": "Extracting melody..."}
+            executor = get_analysis_pool()
+            chord_future = executor.submit(detect_chords_worker, chord_input, shared_sr)
+            melody_future = executor.submit(extract_melody_worker, melody_input, shared_sr)
+            # Status to report while the other step is still running
+            remaining_step = {
+                chord_future: ("extracting_melody", "Extracting melody..."),
+                melody_future: ("detecting_chords", "Detecting chords..."),
+            }
+            first_done = next(as_completed(remaining_step))
+            status, message = remaining_step[first_done]
+            set_job_status(job_id, {"status": status, "progress": 50, "message": message})
             
-            # Step 4: Extract melody contour (use original vocals for melody extraction)
-            print(f"Extracting melody contour...")
-            melody_contour = self.melody_extractor.extract_melody(vocals_path if vocals_path else processed_audio_path)
+            detected_chords = chord_future.result()
+            melody_contour = melody_future.result()
             
             # Update status
-            processing_status[job_id] = {"status": "synthesizing", "progress": 70, "message": "Synthesizing vocals..."}
+            set_job_status(job_id, {"status": "synthesizing", "progress": 70, "message": "Synthesizing vocals..."})
             
             # Step 5: Synthesize sung chord vocals (stable, no pitch mapping)
             print(f"Synthesizing stable chord vocals (no pitch mapping)...")
@@ -97,11 +233,11 @@ class MusicCoachProcessor:
             )
             
             # Update status and store result
-            processing_status[job_id] = {"status": "completed", "progress": 100, "message": "Processing complete!"}
-            processing_results[job_id] = vocals_output_path
+            set_job_status(job_id, {"status": "completed", "progress": 100, "message": "Processing complete!"})
+            set_job_result(job_id, vocals_output_path)
             
-            # Clean up temporary files
-            if os.path.exists(processed_audio_path):
+            # Clean up temporary files; preprocessing may hand back the input file itself
+            if processed_audio_path != input_audio_path and os.path.exists(processed_audio_path):
                 os.unlink(processed_audio_path)
             if os.path.exists(instrumental_path) and instrumental_path != input_audio_path:
                 os.unlink(instrumental_path)
@@ -118,12 +254,13 @@ class MusicCoachProcessor:
             
         except Exception as e:
             # Update status with error
-            processing_status[job_id] = {"status": "error", "progress": 0, "message": f"Error: {str(e)}"}
+            set_job_status(job_id, {"status": "error", "progress": 0, "message": f"Error: {str(e)}"})
             
             # Clean up temporary files if they exist
             for temp_file in ['processed_audio_path', 'instrumental_path', 'vocals_path']:
-                if temp_file in locals() and os.path.exists(locals()[temp_file]):
-                    os.unlink(locals()[temp_file])
+                path = locals().get(temp_file)
+                if path and path != input_audio_path and os.path.exists(path):
+                    os.unlink(path)
             raise Exception(f"Error processing song: {str(e)}")
 
 
@@ -133,7 +270,8 @@ processor = MusicCoachProcessor()
 app = FastAPI(
     title="AI Music Coach",
     description="An AI-powered music learning tool for chord progression training",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -141,29 +279,61 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[config['frontend_url']],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization", "Accept"],
+    max_age=86400,
 )
 
+# Compress larger JSON payloads such as chord progressions
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include API routes
 app.include_router(router)
 
-# Create necessary directories
-os.makedirs("uploads", exist_ok=True)
-os.makedirs("outputs", exist_ok=True)
-os.makedirs("ml_models", exist_ok=True)
+
+@app.on_event("startup")
+async def create_directories():
+    """Create any missing working directories, checking the current directory with a single scan."""
+    with os.scandir(".") as entries:
+        existing = {entry.name for entry in entries if entry.is_dir()}
+    for directory in _REQUIRED_DIRS:
+        if directory not in existing:
+            os.makedirs(directory, exist_ok=True)
+
+
+@app.on_event("startup")
+async def start_analysis_workers():
+    """Start the analysis workers and wait for their models to load before serving."""
+    start_analysis_pool()
+
+
+@app.on_event("shutdown")
+async def stop_analysis_pool():
+    """Stop the analysis worker processes."""
+    shutdown_analysis_pool()
+
+
+@app.on_event("startup")
+async def preload_models():
+    """Load and warm up the shared models once per worker before serving requests."""
+    processor.preload_models()
+    try:
+        processor.warm_up()
+    except Exception as e:
+        print(f"Warning: model warm-up failed: {e}")
 
 
-@app.post("/process-song/")
-async def process_song_endpoint(file: UploadFile = File(...)):
+@app.post("/process-song/", status_code=202)
+async def process_song_endpoint(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
-    Process an uploaded song to create spoken chord vocals.
+    Accept an uploaded song and queue it for processing into spoken chord vocals.
     
     Args:
+        background_tasks: FastAPI background tasks
         file: Uploaded audio file
         
     Returns:
-        Job ID for tracking progress
+        Job ID for tracking progress via /status/{job_id}
     """
     # Validate file type
     allowed_types = ["audio/mpeg", "audio/wav", "audio/flac", "audio/mp4", "audio/ogg"]
@@ -177,36 +347,60 @@ async def process_song_endpoint(file: UploadFile = File(...)):
     job_id = str(uuid.uuid4())
     
     # Initialize status
-    processing_status[job_id] = {"status": "starting", "progress": 0, "message": "Starting processing..."}
+    set_job_status(job_id, {"status": "starting", "progress": 0, "message": "Starting processing..."})
     
-    # Create temporary files
     temp_input_path = None
-    temp_output_path = None
     
     try:
         # Save uploaded file to temporary location
-        temp_input_path = tempfile.mktemp(suffix=os.path.splitext(file.filename)[1])
-        with open(temp_input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        with tempfile.NamedTemporaryFile(suffix=os.path.splitext(file.filename)[1], delete=False) as temp_file:
+            temp_input_path = temp_file.name
+            # Reserve the full upload size up front when the client sent it
+            upload_size = getattr(file, "size", None)
+            if upload_size and hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(temp_file.fileno(), 0, upload_size)
+            async with aiofiles.open(temp_file.fileno(), "wb", closefd=False) as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await buffer.write(chunk)
+                # Drop any reserved space the upload didn't fill
+                await buffer.truncate()
         
         # Create temporary output file
-        temp_output_path = tempfile.mktemp(suffix=".wav")
-        
-        # Process the song
-        result = processor.process_song(temp_input_path, temp_output_path, job_id)
-        
-        # Return job ID for status tracking
-        return {"job_id": job_id, "message": "Processing started"}
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+            temp_output_path = temp_file.name
         
     except Exception as e:
         # Update status with error
-        processing_status[job_id] = {"status": "error", "progress": 0, "message": f"Error: {str(e)}"}
-        raise HTTPException(status_code=500, detail=f"Error processing song: {str(e)}")
-        
-    finally:
-        # Clean up temporary files
+        set_job_status(job_id, {"status": "error", "progress": 0, "message": f"Error: {str(e)}"})
         if temp_input_path and os.path.exists(temp_input_path):
             os.unlink(temp_input_path)
+        raise HTTPException(status_code=500, detail=f"Error saving upload: {str(e)}")
+    
+    # Process the song after the response is sent; clients poll /status/{job_id}
+    background_tasks.add_task(run_processing_job, temp_input_path, temp_output_path, job_id)
+    
+    return {"job_id": job_id, "message": "Processing started"}
+
+
+def run_processing_job(input_audio_path: str, output_audio_path: str, job_id: str):
+    """
+    Run a queued processing job and remove its uploaded input afterwards.
+    The output file is removed too if the job fails, since no download will claim it.
+    
+    Args:
+        input_audio_path: Path to the uploaded audio file
+        output_audio_path: Path where the output audio will be saved
+        job_id: Unique job identifier for status tracking
+    """
+    try:
+        processor.process_song(input_audio_path, output_audio_path, job_id)
+    except Exception as e:
+        # process_song has already recorded the error in processing_status
+        print(f"Job {job_id} failed: {e}")
+        _remove_file(output_audio_path)
+    finally:
+        if os.path.exists(input_audio_path):
+            os.unlink(input_audio_path)
 
 
 @app.get("/status/{job_id}")
@@ -220,11 +414,10 @@ async def get_processing_status(job_id: str):
     Returns:
         Current processing status
     """
-    if job_id not in processing_status:
+    status = get_job_status(job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    status = processing_status[job_id]
-    
     # If completed, include download link
     if status["status"] == "completed":
         status["download_url"] = f"/download/{job_id}"
@@ -243,25 +436,26 @@ async def download_result(job_id: str):
     Returns:
         Processed audio file
     """
-    if job_id not in processing_status:
+    status = get_job_status(job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    status = processing_status[job_id]
     if status["status"] != "completed":
         raise HTTPException(status_code=400, detail="Processing not complete")
     
-    if job_id not in processing_results:
+    file_path = get_job_result(job_id)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="Result file not found")
     
-    file_path = processing_results[job_id]
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Audio file not found")
     
-    # Return the actual processed file with proper headers
+    # Stream the file (sendfile where available) and delete it once it has been sent
     return FileResponse(
         file_path,
         media_type="audio/wav",
-        headers={"Content-Disposition": f'attachment; filename="chord_cover_{job_id}.wav"'}
+        filename=f"chord_cover_{job_id}.wav",
+        background=BackgroundTask(discard_job_result, job_id)
     )
 
 
@@ -4,16 +4,26 @@ Uses Coqui TTS with singing-specific enhancements.
 """
 
 import numpy as np
-from typing import List, Tuple, Optional, Dict, Any
-import asyncio
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import json
 import tempfile
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
 from pydub import AudioSegment
-from scipy.signal import resample
+from scipy.signal import resample_poly
+from scipy.io.wavfile import write as wav_write
 import librosa
 import soundfile as sf
 
+from .mixing import mix_clips, mix_with_instrumental
+
 # TTS Engine - Coqui TTS only
 from TTS.api import TTS
 
@@ -21,6 +31,265 @@ from TTS.api import TTS
 from scipy import signal
 import random
 
+# Optional FFTW backend for reverb convolution and the phase-vocoder pitch shift;
+# imported as backend.synthesis by the app, or as a top-level package by the scripts
+try:
+    from ..audio_processing import fft_backend
+except ImportError:
+    from audio_processing import fft_backend
+
+# Optional JIT for the per-sample compressor
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# On-disk cache of synthesized phrases, shared across synthesizers, processes and runs;
+# TTS_CACHE_DIR overrides the default location under the user's cache directory
+TTS_CACHE_DIR = Path(os.getenv(
+    'TTS_CACHE_DIR',
+    Path(os.getenv('XDG_CACHE_HOME', Path.home() / ".cache")) / "chord-singer" / "tts"
+))
+TTS_CACHE_MAX_FILES = 2000
+
+# Background writer for cache entries, so a fresh synthesis is returned without waiting on disk
+_tts_cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-cache")
+
+
+@lru_cache(maxsize=16)
+def _reverb_ir(sr: int, length_sec: float, decay_sec: float) -> np.ndarray:
+    """
+    Normalized exponential-decay reverb impulse response, built once per sample rate.
+    The result is shared, so callers must not modify it.
+    """
+    reverb_ir = np.exp(-np.arange(int(length_sec * sr)) / (decay_sec * sr))
+    reverb_ir /= np.sum(reverb_ir)
+    reverb_ir.flags.writeable = False
+    return reverb_ir
+
+
+def _soft_compress_numpy(samples: np.ndarray, threshold: float, ratio: float, amount: float) -> np.ndarray:
+    """Scale samples above the threshold down in place: s *= 1 - (|s| - threshold) * (1 - 1/ratio) * amount."""
+    over = np.abs(samples)
+    over -= threshold
+    np.maximum(over, 0, out=over)
+    over *= -(1 - 1 / ratio) * amount
+    over += 1
+    samples *= over
+    return samples
+
+
+if NUMBA_AVAILABLE:
+    # Serial kernel: chords are already processed on a thread pool, and numba's
+    # default threading layer must not be entered from several threads at once
+    @njit(fastmath=True, cache=True)
+    def _soft_compress(samples, threshold, ratio, amount):
+        """Single-pass, in-place version of _soft_compress_numpy."""
+        scale = (1 - 1 / ratio) * amount
+        for i in range(samples.shape[0]):
+            level = abs(samples[i])
+            if level > threshold:
+                samples[i] *= 1 - (level - threshold) * scale
+        return samples
+else:
+    _soft_compress = _soft_compress_numpy
+
+
+@lru_cache(maxsize=32)
+def _vibrato_phase(sr: int, length: int, rate: float, depth: float) -> np.ndarray:
+    """
+    Accumulated vibrato phase for a clip of the given length, built in a single buffer.
+    Cached because repeated chord names produce clips of the same length; read-only.
+    """
+    phase = np.arange(length, dtype=np.float64)
+    phase *= 2 * np.pi * rate / sr
+    np.sin(phase, out=phase)
+    phase *= depth
+    np.cumsum(phase, out=phase)
+    phase.flags.writeable = False
+    return phase
+
+
+@lru_cache(maxsize=32)
+def _vibrato_quadrature(sr: int, length: int, rate: float, depth: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached (cos, sin) of the vibrato phase; read-only."""
+    phase = _vibrato_phase(sr, length, rate, depth)
+    cos_phase, sin_phase = np.cos(phase), np.sin(phase)
+    cos_phase.flags.writeable = False
+    sin_phase.flags.writeable = False
+    return cos_phase, sin_phase
+
+
+def _decode_instrumental(audio_path: str) -> Tuple[np.ndarray, int, int]:
+    """Decode an audio file to read-only interleaved int16 samples."""
+    audio = AudioSegment.from_file(audio_path).set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=np.int16), audio.frame_rate, audio.channels
+
+
+def _duration_ms(instrumental: Tuple[np.ndarray, int, int]) -> int:
+    """Length in milliseconds of (samples, frame_rate, channels) audio."""
+    samples, sr, channels = instrumental
+    return len(samples) // channels * 1000 // sr
+
+
+# Pitch factors this close to 1.0 are left unshifted
+PITCH_SHIFT_TOLERANCE = 0.01
+
+
+# Cached Coqui model list as (monotonic timestamp, voices), also persisted next to the
+# TTS cache so new processes don't have to query Coqui again
+VOICE_CACHE_TTL_SECONDS = 3600
+VOICE_CACHE_FILE = TTS_CACHE_DIR / "voices.json"
+_voice_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+_voice_cache_lock = threading.Lock()
+
+
+# First-order high-pass (y[n] = x[n] - 0.95 x[n-1]) shaping the breath noise, in SOS form
+_BREATH_SOS = signal.tf2sos([1.0, -0.95], [1.0])
+
+
+# NumPy sample types for pydub sample widths
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def _as_float32(audio: AudioSegment) -> np.ndarray:
+    """Read an AudioSegment's samples as float32 with a single copy from its raw buffer."""
+    return np.frombuffer(audio.raw_data, dtype=_SAMPLE_DTYPES[audio.sample_width]).astype(np.float32)
+
+
+def _from_float32(samples: np.ndarray, audio: AudioSegment) -> AudioSegment:
+    """Wrap processed samples in an AudioSegment with the same format as the source audio."""
+    return AudioSegment(
+        samples.astype(_SAMPLE_DTYPES[audio.sample_width], copy=False).tobytes(),
+        frame_rate=audio.frame_rate,
+        sample_width=audio.sample_width,
+        channels=audio.channels
+    )
+
+
+# Sung pronunciation in one pass: elongate vowels, and turn spaces and hyphens
+# into musical pauses
+_SINGING_TRANSLATION = str.maketrans({
+    **{vowel: vowel * 2 for vowel in 'AEIOU'},
+    ' ': ' ... ',
+    '-': ' ... ',
+})
+
+# Root note with an optional accidental at the start of a chord name
+_ROOT_NOTE_RE = re.compile(r'^([A-G][#♯b♭]?)')
+
+_ROOT_PRONUNCIATIONS = {
+    # Natural notes
+    'A': 'AYE',   'B': 'BEE',   'C': 'SEE',   'D': 'DEE',   
+    'E': 'EEE',   'F': 'EFF',   'G': 'GEE',
+    # Sharp notes
+    'A#': 'AYE SHARP',  'A♯': 'AYE SHARP',
+    'B#': 'BEE SHARP',  'B♯': 'BEE SHARP',
+    'C#': 'SEE SHARP',  'C♯': 'SEE SHARP',
+    'D#': 'DEE SHARP',  'D♯': 'DEE SHARP',
+    'E#': 'EEE SHARP',  'E♯': 'EEE SHARP',
+    'F#': 'EFF SHARP',  'F♯': 'EFF SHARP',
+    'G#': 'GEE SHARP',  'G♯': 'GEE SHARP',
+    # Flat notes
+    'Ab': 'AYE FLAT',   'A♭': 'AYE FLAT',
+    'Bb': 'BEE FLAT',   'B♭': 'BEE FLAT',
+    'Cb': 'SEE FLAT',   'C♭': 'SEE FLAT',
+    'Db': 'DEE FLAT',   'D♭': 'DEE FLAT',
+    'Eb': 'EEE FLAT',   'E♭': 'EEE FLAT',
+    'Fb': 'EFF FLAT',   'F♭': 'EFF FLAT',
+    'Gb': 'GEE FLAT',   'G♭': 'GEE FLAT',
+}
+
+# Chord quality pronunciations, in order of specificity
+_CHORD_QUALITY_PRONUNCIATIONS = [
+    ('MAJ7', 'MAJOR SEVEN'),
+    ('MIN7', 'MINOR SEVEN'),
+    ('MAJ', 'MAJOR'),
+    ('MIN', 'MINOR'),
+    ('MINOR', 'MINOR'),
+    ('AUG', 'AUGMENTED'),
+    ('DIM', 'DIMINISHED'),
+    ('SUS4', 'SUSPENDED FOUR'),
+    ('SUS2', 'SUSPENDED TWO'),
+    ('SUS', 'SUSPENDED'),
+    ('ADD', 'ADD'),
+]
+
+# Number pronunciations, longest first
+_NUMBER_PRONUNCIATIONS = {
+    '13': 'THIRTEEN',
+    '11': 'ELEVEN',
+    '9': 'NINE',
+    '7': 'SEVEN',
+    '6': 'SIX',
+    '4': 'FOUR',
+    '2': 'TWO'
+}
+
+
+@lru_cache(maxsize=1024)
+def enhance_for_singing(chord_name: str) -> str:
+    """
+    Enhance chord name text to sound more like singing.
+    Cached since a song repeats the same few chord names.
+    
+    Args:
+        chord_name: Original chord name
+        
+    Returns:
+        Enhanced chord name with singing characteristics
+    """
+    # Convert to uppercase for consistency, then add phrasing, vowel elongation
+    # and pauses for better rhythm
+    return chord_name.upper().translate(_SINGING_TRANSLATION)
+
+
+@lru_cache(maxsize=1024)
+def enhance_for_singing_simple(chord_name: str) -> str:
+    """
+    Enhanced chord pronunciation system for stable chord vocals.
+    Implements proper chord pronunciation mapping as per plan_of_action.txt:
+    - A → "Aye" (not "Ah")
+    - # → "Sharp" 
+    - b → "Flat"
+    - Natural singing pronunciation for all chord types
+    Cached since a song repeats the same few chord names.
+    """
+    enhanced = chord_name.upper()
+    
+    # Phase 1: Parse chord structure more carefully to handle sharps and flats
+    chord_parts = []
+    
+    # Extract root note with sharp/flat as a unit
+    root_match = _ROOT_NOTE_RE.match(enhanced)
+    if root_match:
+        root_with_accidental = root_match.group(1)
+        chord_parts.append(_ROOT_PRONUNCIATIONS.get(root_with_accidental, root_with_accidental))
+        enhanced = enhanced[len(root_with_accidental):]  # Remove the root note with accidental
+    
+    # Phase 3: Apply chord quality pronunciations in order of specificity
+    for quality, pronunciation in _CHORD_QUALITY_PRONUNCIATIONS:
+        if enhanced.startswith(quality):
+            chord_parts.append(pronunciation)
+            enhanced = enhanced[len(quality):]
+            break
+    
+    # Phase 4: Apply number pronunciations in order of length (longest first)
+    for number, pronunciation in _NUMBER_PRONUNCIATIONS.items():
+        if enhanced.startswith(number):
+            chord_parts.append(pronunciation)
+            enhanced = enhanced[len(number):]
+            break
+    
+    # Phase 5: Combine all parts
+    enhanced = ' '.join(chord_parts)
+    
+    # Clean up extra spaces
+    enhanced = ' '.join(enhanced.split())
+    
+    return enhanced
+
 
 class AdvancedVocalSynthesizer:
     """
@@ -28,6 +297,12 @@ class AdvancedVocalSynthesizer:
     Produces natural-sounding vocals with musical characteristics.
     """
     
+    # Threads used to apply per-chord singing enhancements
+    DSP_WORKERS = os.cpu_count() or 1
+    
+    # Rate chord clips are processed at; spoken chord names carry little above 8 kHz
+    DSP_SAMPLE_RATE = 16000
+    
     def __init__(self, 
                  model_name: str = "tts_models/en/ljspeech/tacotron2-DDC",
                  vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2",
@@ -47,6 +322,15 @@ class AdvancedVocalSynthesizer:
         self.rate = rate
         self.volume = volume
         
+        # Route the reverb and pitch-shift FFTs through pyFFTW when it is installed
+        fft_backend.configure()
+        
+        # Identifies the loaded voice in TTS cache keys
+        self._tts_cache_id = f"coqui|{model_name}|{vocoder_name}"
+        
+        # The Coqui model isn't reentrant; the synthesizer is shared across jobs
+        self._tts_lock = threading.Lock()
+        
         # Initialize Coqui TTS
         try:
             self.tts = TTS(model_name=model_name, vocoder_name=vocoder_name, progress_bar=False)
@@ -59,14 +343,15 @@ class AdvancedVocalSynthesizer:
             print(f"Warning: Could not load specific model, using default: {e}")
             # Fall back to default model
             self.tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=False)
+            self._tts_cache_id = "coqui|tts_models/en/ljspeech/tacotron2-DDC|"
             print("✓ Advanced VocalSynthesizer initialized with default Coqui TTS model")
     
     def synthesize_sung_chord_vocals(self, 
                                     chord_timeline: List[Tuple[str, float, float]],
                                     melody_contour: List[Tuple[float, float]],
                                     original_audio_duration_sec: float,
-                                    output_path: str,
-                                    original_audio_path: str) -> str:
+                                    output_path: Union[str, BinaryIO],
+                                    original_audio_path: str) -> Union[str, BinaryIO]:
         """
         Synthesize sung chord vocals with advanced Coqui TTS and singing enhancements.
         
@@ -74,7 +359,7 @@ class AdvancedVocalSynthesizer:
             chord_timeline: List of (chord_name, start_time, end_time)
             melody_contour: List of (timestamp_sec, frequency_hz) from MelodyExtractor
             original_audio_duration_sec: Total duration of the original audio
-            output_path: Path where the output audio will be saved
+            output_path: Path, or writable binary file object, where the output audio will be saved
             original_audio_path: Path to the original audio file for instrumental track
             
         Returns:
@@ -85,76 +370,157 @@ class AdvancedVocalSynthesizer:
         print(f"   Model: {self.model_name}")
         
         # Load the original instrumental track
-        try:
-            instrumental_track = AudioSegment.from_file(original_audio_path)
-            print(f"✓ Loaded instrumental track: {len(instrumental_track)} ms")
-        except Exception as e:
-            print(f"⚠️  Error loading original audio: {e}")
-            instrumental_track = AudioSegment.silent(duration=int(original_audio_duration_sec * 1000))
+        instrumental = self._load_instrumental(original_audio_path, original_audio_duration_sec)
+        instrumental_ms = _duration_ms(instrumental)
         
-        # Generate synthesized vocals
-        vocals_track = AudioSegment.silent(duration=len(instrumental_track))
+        # Synthesize each distinct chord name once; songs repeat a handful of chords
+        enhanced_names = {name: self._enhance_for_singing(name) for name, _, _ in chord_timeline}
+        synthesized = {name: self._synthesize_with_coqui_tts(text) for name, text in enhanced_names.items()}
+        print(f"✓ Synthesized {len(synthesized)} distinct chord names")
         
+        # Generate synthesized vocals, collected as (position_ms, audio) and mixed once
+        # Time-sorted contour arrays, so each chord finds its melody segment by binary search
+        contour = np.asarray(melody_contour, dtype=np.float64).reshape(-1, 2)
+        contour = contour[np.argsort(contour[:, 0], kind='stable')]
+        contour_times = contour[:, 0]
+        
+        chord_jobs = []
         for i, (chord_name, start_time, end_time) in enumerate(chord_timeline):
-            print(f"🎼 Processing chord {i+1}/{len(chord_timeline)}: {chord_name}")
-            
             # Find melody segment for this chord
-            melody_points = [(t, f) for (t, f) in melody_contour 
-                           if start_time <= t < end_time and f > 0]
+            i0, i1 = np.searchsorted(contour_times, (start_time, end_time), side='left')
+            segment = contour[i0:i1]
+            melody_points = list(map(tuple, segment[segment[:, 1] > 0].tolist()))
             
             chord_duration_ms = int((end_time - start_time) * 1000)
-            
-            # Enhance chord name for singing
-            enhanced_chord_name = self._enhance_for_singing(chord_name)
-            print(f"   Enhanced text: '{enhanced_chord_name}'")
+            chord_jobs.append((i, chord_name, start_time, melody_points, chord_duration_ms))
+        
+        def render_chord(job):
+            i, chord_name, start_time, melody_points, chord_duration_ms = job
+            print(f"🎼 Processing chord {i+1}/{len(chord_timeline)}: {chord_name}")
+            print(f"   Enhanced text: '{enhanced_names[chord_name]}'")
             
             try:
-                # Generate audio with Coqui TTS
-                chord_audio = self._synthesize_with_coqui_tts(enhanced_chord_name)
-                
-                # Apply singing enhancements
+                # Reuse the Coqui TTS audio for this chord name and apply singing enhancements
                 chord_audio = self._apply_singing_enhancements(
-                    chord_audio, melody_points, chord_duration_ms
-                )
-                
-                # Overlay at the correct position
-                vocals_track = vocals_track.overlay(
-                    chord_audio, position=int(start_time * 1000)
+                    synthesized[chord_name], melody_points, chord_duration_ms
                 )
-                
                 print(f"   ✓ Generated {len(chord_audio)} ms of audio")
+                return int(start_time * 1000), chord_audio
                 
             except Exception as e:
                 print(f"   ✗ Error generating audio for '{chord_name}': {e}")
-                continue
+                return None
+        
+        # The DSP is NumPy/SciPy/librosa work that mostly releases the GIL,
+        # so independent chords are enhanced on a thread pool
+        workers = max(1, min(self.DSP_WORKERS, len(chord_jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            placements = [placement for placement in executor.map(render_chord, chord_jobs) if placement]
         
-        # Mix instrumental and vocals with better balance
-        instrumental_track = instrumental_track - 8  # Reduce instrumental volume
-        vocals_track = vocals_track + 3  # Boost vocals slightly
+        vocals_track = mix_clips(placements, instrumental_ms)
         
-        combined_audio = instrumental_track.overlay(vocals_track)
+        # Mix instrumental and vocals with better balance: reduce instrumental
+        # volume, boost vocals slightly
+        combined, sr, channels = mix_with_instrumental(instrumental, vocals_track, -8, 3)
         
-        # Export the final audio
-        combined_audio.export(output_path, format='wav')
+        # Export the final audio straight from its 16-bit samples
+        wav_write(output_path, sr, combined.reshape(-1, channels))
         print(f"🎵 Successfully exported to: {output_path}")
         
         return output_path
     
-    def _synthesize_with_coqui_tts(self, text: str) -> AudioSegment:
-        """Synthesize text using Coqui TTS."""
+    def warm_up(self, text: str = "a"):
+        """
+        Run one short, uncached synthesis so the first real chord doesn't pay for
+        lazy model initialization (graph building, vocoder set-up, device transfer).
+        
+        Args:
+            text: Phrase to synthesize
+        """
         try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            # Generate speech with Coqui TTS
-            self.tts.tts_to_file(text=text, file_path=temp_path)
+            with self._tts_lock:
+                self.tts.tts(text=text)
+        except Exception as e:
+            print(f"Warning: Coqui TTS warm-up failed: {e}")
+    
+    def _load_instrumental(self, audio_path: str, fallback_duration_sec: float) -> Tuple[np.ndarray, int, int]:
+        """
+        Load the instrumental track as interleaved int16 samples.
+        
+        Args:
+            audio_path: Path to the original audio file
+            fallback_duration_sec: Length of the silent track used if loading fails
             
-            # Load the generated audio
-            audio = AudioSegment.from_wav(temp_path)
+        Returns:
+            Tuple of (samples, frame_rate, channels)
+        """
+        try:
+            instrumental = _decode_instrumental(audio_path)
+            print(f"✓ Loaded instrumental track: {_duration_ms(instrumental)} ms")
+            return instrumental
+        except Exception as e:
+            print(f"⚠️  Error loading original audio: {e}")
+            return np.zeros(int(fallback_duration_sec * 44100), dtype=np.int16), 44100, 1
+    
+    def _tts_cache_path(self, text: str) -> Path:
+        """Cache file for a phrase, keyed by the loaded voice, rate and text."""
+        key = hashlib.blake2b(f"{self._tts_cache_id}|{self.rate}|{text}".encode('utf-8'),
+                              digest_size=16).hexdigest()
+        return TTS_CACHE_DIR / f"{key}.wav"
+    
+    def _evict_tts_cache(self):
+        """Delete the least recently used cache files once the cache grows past its limit."""
+        try:
+            with os.scandir(TTS_CACHE_DIR) as entries:
+                files = [entry for entry in entries if entry.name.endswith('.wav')]
+            if len(files) <= TTS_CACHE_MAX_FILES:
+                return
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:len(files) - TTS_CACHE_MAX_FILES]:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+        except OSError as e:
+            print(f"Warning: TTS cache eviction failed: {e}")
+    
+    def _store_in_tts_cache(self, cache_path: Path, pcm: np.ndarray, sr: int):
+        """Write synthesized int16 audio to the TTS cache, publishing the file atomically."""
+        try:
+            TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(suffix='.wav', dir=TTS_CACHE_DIR, delete=False) as temp_file:
+                temp_path = temp_file.name
+            try:
+                sf.write(temp_path, pcm, sr, subtype='PCM_16')
+                os.replace(temp_path, cache_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            self._evict_tts_cache()
+        except OSError as e:
+            print(f"Warning: could not write TTS cache entry: {e}")
+    
+    def _synthesize_with_coqui_tts(self, text: str) -> AudioSegment:
+        """Synthesize text using Coqui TTS, reusing cached audio for phrases heard before."""
+        try:
+            cache_path = self._tts_cache_path(text)
+            try:
+                audio = AudioSegment.from_wav(cache_path)
+                # Refresh the mtime so eviction drops the least recently used phrases
+                os.utime(cache_path)
+                return audio
+            except FileNotFoundError:
+                pass
             
-            # Clean up
-            os.unlink(temp_path)
+            # Generate speech with Coqui TTS and build the segment in memory
+            with self._tts_lock:
+                wav = np.asarray(self.tts.tts(text=text), dtype=np.float32)
+                sr = self.tts.synthesizer.output_sample_rate
+            # Same peak scaling Coqui applies when saving to a file
+            pcm = (wav * (32767 / max(0.01, float(np.max(np.abs(wav)))))).astype(np.int16)
+            audio = AudioSegment(pcm.tobytes(), frame_rate=int(sr), sample_width=2, channels=1)
             
+            _tts_cache_writer.submit(self._store_in_tts_cache, cache_path, pcm, sr)
             return audio
             
         except Exception as e:
@@ -162,6 +528,13 @@ class AdvancedVocalSynthesizer:
             # Return silence as fallback
             return AudioSegment.silent(duration=1000)
     
+    def _prepare_for_dsp(self, audio: AudioSegment) -> AudioSegment:
+        """Convert TTS output to 16-bit mono, downsampled to DSP_SAMPLE_RATE if it is higher."""
+        audio = audio.set_channels(1).set_sample_width(2)
+        if audio.frame_rate > self.DSP_SAMPLE_RATE:
+            audio = audio.set_frame_rate(self.DSP_SAMPLE_RATE)
+        return audio
+    
     def _apply_singing_enhancements(self, 
                                   audio: AudioSegment, 
                                   melody_points: List[Tuple[float, float]], 
@@ -177,8 +550,10 @@ class AdvancedVocalSynthesizer:
         Returns:
             Enhanced audio segment
         """
+        audio = self._prepare_for_dsp(audio)
+        
         # Convert to numpy array for processing
-        samples = np.array(audio.get_array_of_samples()).astype(np.float32)
+        samples = _as_float32(audio)
         sr = audio.frame_rate
         
         # Apply pitch mapping if melody points are available
@@ -188,18 +563,11 @@ class AdvancedVocalSynthesizer:
         # Apply singing-specific effects
         samples = self._apply_singing_effects(samples, sr)
         
-        # Convert back to AudioSegment
-        enhanced_audio = AudioSegment(
-            samples.astype(np.int16).tobytes(),
-            frame_rate=int(sr),
-            sample_width=audio.sample_width,
-            channels=audio.channels
-        )
-        
         # Adjust duration to match target
-        enhanced_audio = self._adjust_audio_duration(enhanced_audio, duration_ms)
+        samples = self._adjust_samples_duration(samples, sr, duration_ms)
         
-        return enhanced_audio
+        # Convert back to AudioSegment
+        return _from_float32(samples, audio)
     
     def _apply_pitch_mapping(self, 
                            samples: np.ndarray, 
@@ -236,6 +604,11 @@ class AdvancedVocalSynthesizer:
         pitch_factor = normalized_pitch / original_pitch
         pitch_factor = max(0.8, min(1.4, pitch_factor))
         
+        # Shifts under ~17 cents are inaudible on spoken chord names; skip the phase vocoder
+        if abs(pitch_factor - 1.0) < PITCH_SHIFT_TOLERANCE:
+            print(f"   🎵 Pitch already at {normalized_pitch:.1f} Hz (factor: {pitch_factor:.3f}), skipping pitch shift")
+            return samples
+        
         print(f"   🎵 Spectral pitch mapping: {original_pitch:.1f} Hz → {normalized_pitch:.1f} Hz (factor: {pitch_factor:.2f})")
         
         # Apply spectral pitch shifting (preserves duration)
@@ -267,105 +640,68 @@ class AdvancedVocalSynthesizer:
         vibrato_rate = 4.5  # Hz
         vibrato_depth = 0.015  # 1.5% pitch modulation
         
-        t = np.arange(len(samples)) / sr
-        vibrato = np.sin(2 * np.pi * vibrato_rate * t) * vibrato_depth
+        cos_phase, sin_phase = _vibrato_quadrature(int(sr), len(samples), vibrato_rate, vibrato_depth)
         
-        # Apply vibrato using phase modulation
-        phase = np.cumsum(vibrato)
-        samples = samples * np.cos(phase) + np.roll(samples, 1) * np.sin(phase)
+        # Apply vibrato using phase modulation:
+        # samples * cos(phase) + (samples delayed by one sample) * sin(phase)
+        delayed = np.empty_like(sin_phase)
+        np.multiply(sin_phase[1:], samples[:-1], out=delayed[1:])
+        delayed[0] = sin_phase[0] * samples[-1]
+        mixed = cos_phase * samples
+        mixed += delayed
+        samples = mixed
         
         # 2. Add subtle reverb for more natural sound
-        reverb_length = int(0.08 * sr)  # 80ms reverb
-        if reverb_length > 0:
-            reverb_ir = np.exp(-np.arange(reverb_length) / (0.04 * sr))
-            reverb_ir = reverb_ir / np.sum(reverb_ir)
-            
-            samples = np.convolve(samples, reverb_ir, mode='same')
+        reverb_ir = _reverb_ir(int(sr), 0.08, 0.04)  # 80ms reverb
+        if len(reverb_ir) > 0:
+            samples = signal.oaconvolve(samples, reverb_ir, mode='same')
         
         # 3. Apply gentle compression to even out dynamics
         threshold = 0.6
         ratio = 2.5
         
-        # Simple soft-knee compression
-        gain_reduction = np.where(
-            np.abs(samples) > threshold,
-            (np.abs(samples) - threshold) * (1 - 1/ratio),
-            0
-        )
-        samples = samples * (1 - gain_reduction * 0.5)
+        # Simple soft-knee compression, applied in place
+        samples = _soft_compress(np.ascontiguousarray(samples), threshold, ratio, 0.5)
         
         # 4. Add subtle breathiness (controlled high-frequency content)
         breath_noise = np.random.normal(0, 0.008, len(samples))
         # Simple high-pass effect
-        breath_noise = breath_noise - np.roll(breath_noise, 1) * 0.95
-        samples = samples + breath_noise
+        samples += signal.sosfilt(_BREATH_SOS, breath_noise)
         
         return samples
     
-    def _adjust_audio_duration(self, audio: AudioSegment, target_duration_ms: int) -> AudioSegment:
-        """Adjust audio duration to match target duration."""
-        current_duration_ms = len(audio)
-        
-        if current_duration_ms == target_duration_ms:
-            return audio
-        elif current_duration_ms > target_duration_ms:
-            # Trim the audio to fit
-            return audio[:target_duration_ms]
-        else:
-            # Pad with silence to reach target duration
-            padding_duration_ms = target_duration_ms - current_duration_ms
-            padding = AudioSegment.silent(duration=padding_duration_ms)
-            return audio + padding
+    def _adjust_samples_duration(self, samples: np.ndarray, sr: int, target_duration_ms: int) -> np.ndarray:
+        """Trim, or pad with silence, so the samples last target_duration_ms."""
+        target_length = target_duration_ms * sr // 1000
+        if len(samples) >= target_length:
+            return samples[:target_length]
+        return np.pad(samples, (0, target_length - len(samples)))
     
     def _enhance_for_singing(self, chord_name: str) -> str:
         """
         Enhance chord name text to sound more like singing.
+        See enhance_for_singing.
+        """
+        return enhance_for_singing(chord_name)
+    
+    def prewarm(self, chord_names: Iterable[str], stable: bool = False):
+        """
+        Synthesize each distinct chord name once so later renders hit the TTS cache.
         
         Args:
-            chord_name: Original chord name
-            
-        Returns:
-            Enhanced chord name with singing characteristics
+            chord_names: Chord names that are about to be sung
+            stable: Prepare the pronunciation used by the stable vocals instead of the sung one
         """
-        # Convert to uppercase for consistency
-        enhanced = chord_name.upper()
-        
-        # Add musical phrasing and elongation
-        enhanced = enhanced.replace(' ', ' ... ')
-        
-        # Elongate vowels for singing effect (more subtly)
-        enhanced = re.sub(r'([AEIOU])', r'\1\1', enhanced)
-        
-        # Add musical emphasis to common chord types
-        enhanced = enhanced.replace('MAJOR', 'MAAY-JOR')
-        enhanced = enhanced.replace('MINOR', 'MIIIN-OR')
-        enhanced = enhanced.replace('SEVEN', 'SEV-EN')
-        enhanced = enhanced.replace('NINE', 'NIIINE')
-        enhanced = enhanced.replace('ELEVEN', 'ELEV-EN')
-        enhanced = enhanced.replace('THIRTEEN', 'THIR-TEEN')
-        
-        # Add musical pauses for better rhythm
-        enhanced = enhanced.replace('-', ' ... ')
-        
-        return enhanced
+        enhance = self._enhance_for_singing_simple if stable else self._enhance_for_singing
+        for text in {enhance(name) for name in chord_names}:
+            self._synthesize_with_coqui_tts(text)
     
     def get_available_voices(self) -> List[Dict[str, Any]]:
-        """Get list of available voices for Coqui TTS."""
-        try:
-            available_models = TTS.list_models()
-            return [
-                {
-                    'id': model,
-                    'name': model.split('/')[-1],
-                    'language': 'en' if '/en/' in model else 'other',
-                    'type': 'tts'
-                }
-                for model in available_models
-                if 'tts_models' in model and '/en/' in model
-            ]
-        except Exception as e:
-            print(f"Error getting Coqui TTS models: {e}")
-            return []
+        """
+        Get list of available voices for Coqui TTS.
+        The model list rarely changes, so it is cached (see list_available_voices).
+        """
+        return list_available_voices()
     
     def set_voice_properties(self, rate: float = None, volume: float = None, model_name: str = None):
         """Update voice properties."""
@@ -388,15 +724,15 @@ class AdvancedVocalSynthesizer:
     def synthesize_stable_chord_vocals(self, 
                                      chord_timeline: List[Tuple[str, float, float]],
                                      original_audio_duration_sec: float,
-                                     output_path: str,
-                                     original_audio_path: str) -> str:
+                                     output_path: Union[str, BinaryIO],
+                                     original_audio_path: str) -> Union[str, BinaryIO]:
         """
         Synthesize stable chord vocals without pitch mapping (easier to follow).
         
         Args:
             chord_timeline: List of (chord_name, start_time, end_time)
             original_audio_duration_sec: Total duration of the original audio
-            output_path: Path where the output audio will be saved
+            output_path: Path, or writable binary file object, where the output audio will be saved
             original_audio_path: Path to the original audio file for instrumental track
             
         Returns:
@@ -405,15 +741,11 @@ class AdvancedVocalSynthesizer:
         print(f"🎵 Synthesizing stable chord vocals for {len(chord_timeline)} chords")
         
         # Load the original instrumental track
-        try:
-            instrumental_track = AudioSegment.from_file(original_audio_path)
-            print(f"✓ Loaded instrumental track: {len(instrumental_track)} ms")
-        except Exception as e:
-            print(f"⚠️  Error loading original audio: {e}")
-            instrumental_track = AudioSegment.silent(duration=int(original_audio_duration_sec * 1000))
+        instrumental = self._load_instrumental(original_audio_path, original_audio_duration_sec)
+        instrumental_ms = _duration_ms(instrumental)
         
-        # Generate synthesized vocals
-        vocals_track = AudioSegment.silent(duration=len(instrumental_track))
+        # Generate synthesized vocals, collected as (position_ms, audio) and mixed once
+        placements = []
         
         for i, (chord_name, start_time, end_time) in enumerate(chord_timeline):
             print(f"🎼 Processing chord {i+1}/{len(chord_timeline)}: {chord_name}")
@@ -441,10 +773,8 @@ class AdvancedVocalSynthesizer:
                 # Apply basic singing enhancements (no pitch mapping)
                 chord_audio = self._apply_basic_singing_enhancements(chord_audio, chord_duration_ms)
                 
-                # Overlay at the correct position
-                vocals_track = vocals_track.overlay(
-                    chord_audio, position=int(start_time * 1000)
-                )
+                # Place at the correct position
+                placements.append((int(start_time * 1000), chord_audio))
                 
                 print(f"   ✓ Generated {len(chord_audio)} ms of stable audio")
                 
@@ -452,14 +782,14 @@ class AdvancedVocalSynthesizer:
                 print(f"   ✗ Error generating audio for '{chord_name}': {e}")
                 continue
         
-        # Mix instrumental and vocals
-        instrumental_track = instrumental_track - 10  # Reduce instrumental volume more
-        vocals_track = vocals_track + 5  # Boost vocals more for clarity
+        vocals_track = mix_clips(placements, instrumental_ms)
         
-        combined_audio = instrumental_track.overlay(vocals_track)
+        # Mix instrumental and vocals: reduce instrumental volume more, boost
+        # vocals more for clarity
+        combined, sr, channels = mix_with_instrumental(instrumental, vocals_track, -10, 5)
         
-        # Export the final audio
-        combined_audio.export(output_path, format='wav')
+        # Export the final audio straight from its 16-bit samples
+        wav_write(output_path, sr, combined.reshape(-1, channels))
         print(f"🎵 Successfully exported stable vocals to: {output_path}")
         
         return output_path
@@ -467,92 +797,9 @@ class AdvancedVocalSynthesizer:
     def _enhance_for_singing_simple(self, chord_name: str) -> str:
         """
         Enhanced chord pronunciation system for stable chord vocals.
-        Implements proper chord pronunciation mapping as per plan_of_action.txt:
-        - A → "Aye" (not "Ah")
-        - # → "Sharp" 
-        - b → "Flat"
-        - Natural singing pronunciation for all chord types
-        """
-        enhanced = chord_name.upper()
-        
-        # Phase 1: Parse chord structure more carefully to handle sharps and flats
-        chord_parts = []
-        
-        # Extract root note with sharp/flat as a unit
-        root_match = re.match(r'^([A-G][#♯b♭]?)', enhanced)
-        if root_match:
-            root_with_accidental = root_match.group(1)
-            root_pronunciations = {
-                # Natural notes
-                'A': 'AYE',   'B': 'BEE',   'C': 'SEE',   'D': 'DEE',   
-                'E': 'EEE',   'F': 'EFF',   'G': 'GEE',
-                # Sharp notes
-                'A#': 'AYE SHARP',  'A♯': 'AYE SHARP',
-                'B#': 'BEE SHARP',  'B♯': 'BEE SHARP',
-                'C#': 'SEE SHARP',  'C♯': 'SEE SHARP',
-                'D#': 'DEE SHARP',  'D♯': 'DEE SHARP',
-                'E#': 'EEE SHARP',  'E♯': 'EEE SHARP',
-                'F#': 'EFF SHARP',  'F♯': 'EFF SHARP',
-                'G#': 'GEE SHARP',  'G♯': 'GEE SHARP',
-                # Flat notes
-                'Ab': 'AYE FLAT',   'A♭': 'AYE FLAT',
-                'Bb': 'BEE FLAT',   'B♭': 'BEE FLAT',
-                'Cb': 'SEE FLAT',   'C♭': 'SEE FLAT',
-                'Db': 'DEE FLAT',   'D♭': 'DEE FLAT',
-                'Eb': 'EEE FLAT',   'E♭': 'EEE FLAT',
-                'Fb': 'EFF FLAT',   'F♭': 'EFF FLAT',
-                'Gb': 'GEE FLAT',   'G♭': 'GEE FLAT',
-            }
-            chord_parts.append(root_pronunciations.get(root_with_accidental, root_with_accidental))
-            enhanced = enhanced[len(root_with_accidental):]  # Remove the root note with accidental
-        
-        # Phase 3: Chord quality pronunciations
-        chord_quality_pronunciations = [
-            ('MAJ7', 'MAJOR SEVEN'),
-            ('MIN7', 'MINOR SEVEN'),
-            ('MAJ', 'MAJOR'),
-            ('MIN', 'MINOR'),
-            ('MINOR', 'MINOR'),
-            ('AUG', 'AUGMENTED'),
-            ('DIM', 'DIMINISHED'),
-            ('SUS4', 'SUSPENDED FOUR'),
-            ('SUS2', 'SUSPENDED TWO'),
-            ('SUS', 'SUSPENDED'),
-            ('ADD', 'ADD'),
-        ]
-        
-        # Apply chord quality pronunciations in order of specificity
-        for quality, pronunciation in chord_quality_pronunciations:
-            if enhanced.startswith(quality):
-                chord_parts.append(pronunciation)
-                enhanced = enhanced[len(quality):]
-                break
-        
-        # Phase 4: Number pronunciations  
-        number_pronunciations = {
-            '13': 'THIRTEEN',
-            '11': 'ELEVEN',
-            '9': 'NINE',
-            '7': 'SEVEN',
-            '6': 'SIX',
-            '4': 'FOUR',
-            '2': 'TWO'
-        }
-        
-        # Apply number pronunciations in order of length (longest first)
-        for number, pronunciation in number_pronunciations.items():
-            if enhanced.startswith(number):
-                chord_parts.append(pronunciation)
-                enhanced = enhanced[len(number):]
-                break
-        
-        # Phase 5: Combine all parts
-        enhanced = ' '.join(chord_parts)
-        
-        # Clean up extra spaces
-        enhanced = ' '.join(enhanced.split())
-        
-        return enhanced
+        See enhance_for_singing_simple.
+        """
+        return enhance_for_singing_simple(chord_name)
     
     def _generate_filler_words(self, 
                              current_chord: str, 
@@ -637,25 +884,20 @@ class AdvancedVocalSynthesizer:
         """
         Apply basic singing enhancements without pitch mapping.
         """
+        audio = self._prepare_for_dsp(audio)
+        
         # Convert to numpy array for processing
-        samples = np.array(audio.get_array_of_samples()).astype(np.float32)
+        samples = _as_float32(audio)
         sr = audio.frame_rate
         
         # Apply subtle singing effects
         samples = self._apply_subtle_singing_effects(samples, sr)
         
-        # Convert back to AudioSegment
-        enhanced_audio = AudioSegment(
-            samples.astype(np.int16).tobytes(),
-            frame_rate=int(sr),
-            sample_width=audio.sample_width,
-            channels=audio.channels
-        )
-        
         # Adjust duration to match target
-        enhanced_audio = self._adjust_audio_duration(enhanced_audio, duration_ms)
+        samples = self._adjust_samples_duration(samples, sr, duration_ms)
         
-        return enhanced_audio
+        # Convert back to AudioSegment
+        return _from_float32(samples, audio)
     
     def _apply_subtle_singing_effects(self, samples: np.ndarray, sr: int) -> np.ndarray:
         """Apply subtle singing effects for stable vocals."""
@@ -666,32 +908,24 @@ class AdvancedVocalSynthesizer:
         vibrato_rate = 3.5  # Hz
         vibrato_depth = 0.01  # 1% pitch modulation
         
-        t = np.arange(len(samples)) / sr
-        vibrato = np.sin(2 * np.pi * vibrato_rate * t) * vibrato_depth
+        phase = _vibrato_phase(int(sr), len(samples), vibrato_rate, vibrato_depth)
         
         # Apply very light vibrato
-        phase = np.cumsum(vibrato) * 0.5
-        samples = samples * (1 + phase * 0.1)
+        gain = phase * (0.5 * 0.1)
+        gain += 1
+        samples = samples * gain
         
         # 2. Light reverb
-        reverb_length = int(0.05 * sr)  # 50ms reverb
-        if reverb_length > 0:
-            reverb_ir = np.exp(-np.arange(reverb_length) / (0.03 * sr))
-            reverb_ir = reverb_ir / np.sum(reverb_ir)
-            
-            reverb_signal = np.convolve(samples, reverb_ir, mode='same')
+        reverb_ir = _reverb_ir(int(sr), 0.05, 0.03)  # 50ms reverb
+        if len(reverb_ir) > 0:
+            reverb_signal = signal.oaconvolve(samples, reverb_ir, mode='same')
             samples = samples * 0.8 + reverb_signal * 0.2
         
         # 3. Gentle compression
         threshold = 0.7
         ratio = 2.0
         
-        gain_reduction = np.where(
-            np.abs(samples) > threshold,
-            (np.abs(samples) - threshold) * (1 - 1/ratio) * 0.3,
-            0
-        )
-        samples = samples * (1 - gain_reduction)
+        samples = _soft_compress(np.ascontiguousarray(samples), threshold, ratio, 0.3)
         
         return samples
     
@@ -730,21 +964,51 @@ class AdvancedVocalSynthesizer:
             
         except Exception as e:
             print(f"Phase vocoder failed, falling back to resampling: {e}")
-            # Fallback to resampling if phase vocoder fails
-            new_length = int(len(samples) / pitch_factor)
-            if new_length > 1:
-                return resample(samples, new_length)
+            # Fallback to resampling if phase vocoder fails. Polyphase resampling by a
+            # rational approximation of the factor avoids FFT-based resample's slow
+            # paths on awkward (e.g. prime) lengths.
+            ratio = Fraction(pitch_factor).limit_denominator(100)
+            if len(samples) * ratio.denominator // ratio.numerator > 1:
+                return resample_poly(samples, ratio.denominator, ratio.numerator)
             else:
                 return samples
 
 
+_synthesizers: Dict[Tuple[str, str], AdvancedVocalSynthesizer] = {}
+_synthesizers_lock = threading.Lock()
+
+
+def get_synthesizer(model_name: str = "tts_models/en/ljspeech/tacotron2-DDC",
+                    vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2") -> AdvancedVocalSynthesizer:
+    """
+    Get the shared synthesizer for a model/vocoder pair, creating it on first use.
+    The Coqui TTS models are loaded once per process and reused by every caller.
+    
+    Args:
+        model_name: Coqui TTS model to use
+        vocoder_name: Vocoder model to use
+        
+    Returns:
+        Shared AdvancedVocalSynthesizer instance
+    """
+    key = (model_name, vocoder_name)
+    synthesizer = _synthesizers.get(key)
+    if synthesizer is None:
+        with _synthesizers_lock:
+            synthesizer = _synthesizers.get(key)
+            if synthesizer is None:
+                synthesizer = AdvancedVocalSynthesizer(model_name=model_name, vocoder_name=vocoder_name)
+                _synthesizers[key] = synthesizer
+    return synthesizer
+
+
 def synthesize_sung_chord_vocals_sync(chord_timeline: List[Tuple[str, float, float]],
                                      melody_contour: List[Tuple[float, float]],
                                      original_audio_duration_sec: float,
-                                     output_path: str,
+                                     output_path: Union[str, BinaryIO],
                                      original_audio_path: str,
                                      model_name: str = "tts_models/en/ljspeech/tacotron2-DDC",
-                                     vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2") -> str:
+                                     vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2") -> Union[str, BinaryIO]:
     """
     Synchronous wrapper for synthesize_sung_chord_vocals.
     
@@ -752,7 +1016,7 @@ def synthesize_sung_chord_vocals_sync(chord_timeline: List[Tuple[str, float, flo
         chord_timeline: List of (chord_name, start_time, end_time)
         melody_contour: List of (timestamp_sec, frequency_hz)
         original_audio_duration_sec: Duration of original audio
-        output_path: Output file path
+        output_path: Output file path or writable binary file object
         original_audio_path: Original audio file path
         model_name: Coqui TTS model to use
         vocoder_name: Vocoder model to use
@@ -760,35 +1024,28 @@ def synthesize_sung_chord_vocals_sync(chord_timeline: List[Tuple[str, float, flo
     Returns:
         Path to generated audio file
     """
-    synthesizer = AdvancedVocalSynthesizer(
-        model_name=model_name,
-        vocoder_name=vocoder_name
-    )
+    synthesizer = get_synthesizer(model_name=model_name, vocoder_name=vocoder_name)
     
-    try:
-        # Call the synchronous function directly
-        result = synthesizer.synthesize_sung_chord_vocals(
-            chord_timeline, melody_contour, original_audio_duration_sec,
-            output_path, original_audio_path
-        )
-        return result
-    finally:
-        synthesizer.cleanup()
+    # Call the synchronous function directly
+    return synthesizer.synthesize_sung_chord_vocals(
+        chord_timeline, melody_contour, original_audio_duration_sec,
+        output_path, original_audio_path
+    )
 
 
 def synthesize_stable_chord_vocals_sync(chord_timeline: List[Tuple[str, float, float]],
                                        original_audio_duration_sec: float,
-                                       output_path: str,
+                                       output_path: Union[str, BinaryIO],
                                        original_audio_path: str,
                                        model_name: str = "tts_models/en/ljspeech/tacotron2-DDC",
-                                       vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2") -> str:
+                                       vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2") -> Union[str, BinaryIO]:
     """
     Synchronous wrapper for synthesize_stable_chord_vocals.
     
     Args:
         chord_timeline: List of (chord_name, start_time, end_time)
         original_audio_duration_sec: Duration of original audio
-        output_path: Output file path
+        output_path: Output file path or writable binary file object
         original_audio_path: Original audio file path
         model_name: Coqui TTS model to use
         vocoder_name: Vocoder model to use
@@ -796,17 +1053,80 @@ def synthesize_stable_chord_vocals_sync(chord_timeline: List[Tuple[str, float, f
     Returns:
         Path to generated audio file
     """
-    synthesizer = AdvancedVocalSynthesizer(
-        model_name=model_name,
-        vocoder_name=vocoder_name
-    )
+    synthesizer = get_synthesizer(model_name=model_name, vocoder_name=vocoder_name)
     
+    # Call the synchronous function directly
+    return synthesizer.synthesize_stable_chord_vocals(
+        chord_timeline, original_audio_duration_sec,
+        output_path, original_audio_path
+    )
+
+
+def _query_voices() -> List[Dict[str, Any]]:
+    """Query Coqui TTS for its English TTS models."""
     try:
-        # Call the synchronous function directly
-        result = synthesizer.synthesize_stable_chord_vocals(
-            chord_timeline, original_audio_duration_sec,
-            output_path, original_audio_path
-        )
-        return result
-    finally:
-        synthesizer.cleanup()
+        available_models = TTS.list_models()
+        return [
+            {
+                'id': model,
+                'name': model.split('/')[-1],
+                'language': 'en' if '/en/' in model else 'other',
+                'type': 'tts'
+            }
+            for model in available_models
+            if 'tts_models' in model and '/en/' in model
+        ]
+    except Exception as e:
+        print(f"Error getting Coqui TTS models: {e}")
+        return []
+
+
+def _read_voice_cache_file() -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+    """Load the persisted model list as (monotonic timestamp, voices) if it is still fresh."""
+    try:
+        age = time.time() - VOICE_CACHE_FILE.stat().st_mtime
+        if age >= VOICE_CACHE_TTL_SECONDS:
+            return None
+        voices = json.loads(VOICE_CACHE_FILE.read_text(encoding='utf-8'))
+        return (time.monotonic() - age, voices) if voices else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_voice_cache_file(voices: List[Dict[str, Any]]):
+    """Persist the model list, publishing the file atomically."""
+    try:
+        VOICE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = VOICE_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(voices), encoding='utf-8')
+        os.replace(temp_path, VOICE_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: could not persist the voice list: {e}")
+
+
+def list_available_voices() -> List[Dict[str, Any]]:
+    """
+    Get the Coqui TTS models usable as voices, without loading a model.
+    The list rarely changes, so it is cached in memory and on disk for VOICE_CACHE_TTL_SECONDS.
+    
+    Returns:
+        List of voice dictionaries (id, name, language, type)
+    """
+    global _voice_cache
+    cached = _voice_cache
+    if cached is not None and time.monotonic() - cached[0] < VOICE_CACHE_TTL_SECONDS:
+        return list(cached[1])
+    
+    with _voice_cache_lock:
+        cached = _voice_cache
+        if cached is None or time.monotonic() - cached[0] >= VOICE_CACHE_TTL_SECONDS:
+            cached = _read_voice_cache_file()
+        if cached is not None:
+            _voice_cache = cached
+            return list(cached[1])
+        voices = _query_voices()
+        # Don't cache failures, so the next call retries
+        if voices:
+            _voice_cache = (time.monotonic(), voices)
+            _write_voice_cache_file(voices)
+        return list(voices)
@@ -0,0 +1,68 @@
+"""
+NumPy mixing shared by the vocal synthesizers: placing chord clips on a vocals track and
+laying the vocals over the instrumental, with pydub-style saturation.
+"""
+
+import numpy as np
+from typing import List, Tuple
+from pydub import AudioSegment
+
+
+def mix_clips(placements: List[Tuple[int, AudioSegment]], duration_ms: int) -> AudioSegment:
+    """
+    Mix audio clips into one mono 16-bit track with a single NumPy buffer instead of
+    overlaying each clip onto a full-length AudioSegment.
+
+    Args:
+        placements: List of (position_ms, audio) clips
+        duration_ms: Length of the mixed track in milliseconds
+
+    Returns:
+        Mixed track at the first clip's frame rate (silence if there are no clips);
+        clips running past the end are cut off
+    """
+    if not placements:
+        return AudioSegment.silent(duration=duration_ms)
+
+    sr = placements[0][1].frame_rate
+    mix = np.zeros(duration_ms * sr // 1000, dtype=np.int32)
+    for position_ms, clip in placements:
+        clip = clip.set_channels(1).set_frame_rate(sr).set_sample_width(2)
+        samples = np.frombuffer(clip.raw_data, dtype=np.int16)
+        start = position_ms * sr // 1000
+        end = min(start + len(samples), len(mix))
+        if end > start:
+            mix[start:end] += samples[:end - start]
+
+    # Saturate like pydub's overlay does
+    np.clip(mix, -32768, 32767, out=mix)
+    return AudioSegment(mix.astype(np.int16).tobytes(), frame_rate=sr, sample_width=2, channels=1)
+
+
+def mix_with_instrumental(instrumental: Tuple[np.ndarray, int, int],
+                          vocals_track: AudioSegment,
+                          instrumental_gain_db: float,
+                          vocals_gain_db: float) -> Tuple[np.ndarray, int, int]:
+    """
+    Apply gains and mix the vocals onto the instrumental in NumPy.
+    Equivalent to (instrumental + gain).overlay(vocals + gain) in pydub, but the
+    result stays as samples so it can be written without building an AudioSegment.
+
+    Args:
+        instrumental: Tuple of (interleaved int16 samples, frame_rate, channels)
+        vocals_track: Mixed vocals track
+        instrumental_gain_db: Gain applied to the instrumental in dB
+        vocals_gain_db: Gain applied to the vocals in dB
+
+    Returns:
+        Tuple of (interleaved int16 samples, frame_rate, channels), as long as the instrumental
+    """
+    samples, sr, channels = instrumental
+    vocals_track = vocals_track.set_frame_rate(sr).set_channels(channels).set_sample_width(2)
+    vocals = np.frombuffer(vocals_track.raw_data, dtype=np.int16)
+
+    mix = samples * np.float32(10 ** (instrumental_gain_db / 20))
+    n = min(len(mix), len(vocals))
+    mix[:n] += vocals[:n] * np.float32(10 ** (vocals_gain_db / 20))
+    np.clip(mix, -32768, 32767, out=mix)
+    return mix.astype(np.int16), sr, channels
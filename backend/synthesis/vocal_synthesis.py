@@ -3,14 +3,81 @@ Vocal synthesis module for generating sung chord names using Coqui TTS.
 """
 
 import numpy as np
-from typing import List, Tuple
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 import tempfile
 import os
-from scipy.signal import resample
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from fractions import Fraction
+from scipy.signal import resample_poly
+from scipy.io.wavfile import write as wav_write
 import re
 from pydub import AudioSegment
 from TTS.api import TTS
 import librosa
+import logging
+
+from .mixing import mix_clips, mix_with_instrumental
+
+# Per-chord tracing goes to DEBUG; it is silent unless logging is configured for it
+logger = logging.getLogger("chord-singer.vocal_synthesis")
+
+# Optional JIT for the resampling fallback
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _lerp_resample(samples, factor):
+        """
+        Resample by linear interpolation, reading the input at steps of `factor`.
+        Output length is len(samples) / factor, so factor > 1 raises the pitch.
+        """
+        n_out = int(samples.shape[0] / factor)
+        out = np.empty(n_out, dtype=np.float32)
+        last = samples.shape[0] - 1
+        for i in range(n_out):
+            position = i * factor
+            j = int(position)
+            if j >= last:
+                out[i] = samples[last]
+            else:
+                frac = position - j
+                out[i] = samples[j] + (samples[j + 1] - samples[j]) * frac
+        return out
+
+
+# Root note at the start of an upper-cased chord symbol
+_ROOT_RE = re.compile(r'^[A-G][#B]?b?')
+
+# Syllables for common chord types
+_CHORD_SYLLABLES = {
+    'MAJ7': ('major', 'seven'),
+    'MIN7': ('minor', 'seven'),
+    'MAJ': ('major',),
+    'MIN': ('minor',),
+    'M': ('major',),
+    'MINOR': ('minor',),
+    'AUG': ('augmented',),
+    'DIM': ('diminished',),
+    '7': ('seven',),
+    '6': ('six',),
+    '9': ('nine',),
+    '11': ('eleven',),
+    '13': ('thirteen',),
+}
+
+# One alternation over the chord types; the regex takes the first alternative that
+# matches, so longer tokens go first and e.g. 'MINOR' is not read as 'M' + 'INOR'
+_CHORD_RE = re.compile('|'.join(
+    re.escape(token) for token in sorted(_CHORD_SYLLABLES, key=len, reverse=True)
+))
 
 
 class VocalSynthesizer:
@@ -18,19 +85,63 @@ class VocalSynthesizer:
     A class for synthesizing sung chord names using Coqui TTS with singing characteristics.
     """
     
+    # Threads used to pitch-shift chords to the melody
+    DSP_WORKERS = os.cpu_count() or 1
+    
+    # Highest rate synthesized chord names are kept at
+    TTS_SAMPLE_RATE = 16000
+    
+    # Pitch factors closer to 1.0 than this are left unshifted
+    PITCH_SHIFT_TOLERANCE = 0.01
+    
+    # Initial size of the per-thread conversion buffers (four seconds of chord audio)
+    MAX_CHORD_SAMPLES = TTS_SAMPLE_RATE * 4
+    
+    # Decoded instrumentals kept when audio caching is enabled
+    AUDIO_CACHE_SIZE = 4
+    
+    # Pitch-shifted chord renders kept, least recently used evicted first; melody contours
+    # are continuous, so without a cap nearly every frame would add a new entry
+    SHIFT_CACHE_SIZE = 64
+    
     def __init__(self, model_name: str = "tts_models/en/ljspeech/tacotron2-DDC", 
-                 vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2"):
+                 vocoder_name: str = "vocoder_models/en/ljspeech/hifigan_v2",
+                 cache_decoded_audio: bool = False):
         """
         Initialize the vocal synthesizer with Coqui TTS.
         
         Args:
             model_name: Coqui TTS model to use
             vocoder_name: Vocoder model to use for audio generation
+            cache_decoded_audio: Keep up to AUDIO_CACHE_SIZE decoded instrumentals so
+                repeated calls on the same unmodified file skip the decode; cleared by cleanup()
         """
         self.model_name = model_name
         self.rate = 1.0
         self.volume = 1.0
         
+        # Chord names repeat throughout a song; keep synthesized and pitch-shifted audio.
+        # AudioSegments are immutable, so cached segments can be handed out directly.
+        self._tts_cache: Dict[str, AudioSegment] = {}
+        self._shift_cache: "OrderedDict[Tuple[str, float], np.ndarray]" = OrderedDict()
+        self._shift_cache_lock = threading.Lock()
+        
+        # Decoded audio as (int16 samples, frame_rate, channels), keyed by (path, mtime);
+        # None unless caching was requested
+        self._audio_cache: Optional[Dict[Tuple[str, int], Tuple[np.ndarray, int, int]]] = (
+            {} if cache_decoded_audio else None
+        )
+        self._audio_cache_lock = threading.Lock()
+        
+        # Silent segments per frame rate, sliced for padding
+        self._silence_cache: Dict[int, AudioSegment] = {}
+        
+        # Reusable float32/int16 conversion buffers, one set per rendering thread
+        self._scratch = threading.local()
+        
+        # The Coqui model isn't reentrant; chords are rendered on worker threads
+        self._tts_lock = threading.Lock()
+        
         # Initialize Coqui TTS
         try:
             self.tts = TTS(model_name=model_name, vocoder_name=vocoder_name, progress_bar=False)
@@ -43,43 +154,99 @@ class VocalSynthesizer:
     
     def synthesize_spoken_chord_vocals(self, chord_timeline: List[Tuple[str, float, float]], 
                                      original_audio_duration_sec: float, 
-                                     output_path: str) -> str:
+                                     output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
         """
         Synthesize spoken chord vocals aligned with the original song timing.
         
         Args:
             chord_timeline: List of tuples (chord_name, start_time, end_time)
             original_audio_duration_sec: Total duration of the original audio
-            output_path: Path where the output audio will be saved
+            output_path: Path, or writable binary file object, where the output audio will be saved
             
         Returns:
             Path to the generated audio file
         """
-        # Create a silent audio segment for the full duration
         total_duration_ms = int(original_audio_duration_sec * 1000)
-        combined_audio = AudioSegment.silent(duration=total_duration_ms)
+        placements = []
+        
+        # Synthesize each distinct chord name once before placing them
+        chord_audio = self._synthesize_chords(chord_name for chord_name, _, _ in chord_timeline)
+        
+        # Songs repeat the same chord for the same length, so each (chord, duration)
+        # clip is fitted once; AudioSegments are immutable and safe to place repeatedly
+        adjusted_clips = {}
         
         # Process each chord in the timeline
         for chord_name, start_time, end_time in chord_timeline:
-            # Generate spoken audio for this chord
-            chord_audio = self._synthesize_single_chord(chord_name)
-            
             # Calculate timing in milliseconds
             start_ms = int(start_time * 1000)
             end_ms = int(end_time * 1000)
             chord_duration_ms = end_ms - start_ms
             
             # Adjust chord audio duration to match the chord timing
-            adjusted_chord_audio = self._adjust_audio_duration(chord_audio, chord_duration_ms)
+            clip_key = (chord_name, chord_duration_ms)
+            adjusted_chord_audio = adjusted_clips.get(clip_key)
+            if adjusted_chord_audio is None:
+                adjusted_chord_audio = self._adjust_audio_duration(chord_audio[chord_name], chord_duration_ms)
+                adjusted_clips[clip_key] = adjusted_chord_audio
             
-            # Overlay the chord audio at the correct position
-            combined_audio = combined_audio.overlay(adjusted_chord_audio, position=start_ms)
+            # Place the chord audio at the correct position
+            placements.append((start_ms, adjusted_chord_audio))
+        
+        # Mix every chord into the full-length track in one pass
+        combined_audio = mix_clips(placements, total_duration_ms)
         
-        # Export the final audio
-        combined_audio.export(output_path, format='wav')
+        # Export the final audio straight from its 16-bit samples
+        wav_write(output_path, combined_audio.frame_rate, np.frombuffer(combined_audio.raw_data, dtype=np.int16))
         
         return output_path
     
+    def _synthesize_chords(self, chord_names: Iterable[str]) -> Dict[str, AudioSegment]:
+        """
+        Synthesize each distinct chord text once, filling the TTS cache.
+        The Coqui model is not thread-safe, so the uncached texts are rendered back to back
+        in a single hold of the model lock; scaling and resampling happen after it is released.
+        
+        Args:
+            chord_names: Chord texts to synthesize; duplicates are skipped
+            
+        Returns:
+            Dictionary mapping each chord text to its audio
+        """
+        names = list(dict.fromkeys(chord_names))
+        missing = [name for name in names if name not in self._tts_cache]
+        if self.tts and missing:
+            rendered = {}
+            with self._tts_lock:
+                sr = self.tts.synthesizer.output_sample_rate
+                for chord_name in missing:
+                    try:
+                        rendered[chord_name] = np.asarray(self.tts.tts(text=chord_name), dtype=np.float32)
+                    except Exception as e:
+                        logger.error("Error synthesizing chord '%s': %s", chord_name, e)
+            for chord_name, wav in rendered.items():
+                self._tts_cache[chord_name] = self._chord_audio(wav, sr)
+        return {chord_name: self._synthesize_single_chord(chord_name) for chord_name in names}
+    
+    def _chord_audio(self, wav: np.ndarray, sr: int) -> AudioSegment:
+        """
+        Turn a Coqui waveform into the 16-bit mono segment kept in the TTS cache.
+        
+        Args:
+            wav: Float waveform returned by the model
+            sr: Model output sample rate
+            
+        Returns:
+            AudioSegment at no more than TTS_SAMPLE_RATE
+        """
+        # Same peak scaling Coqui applies when saving to a file
+        pcm = (wav * (32767 / max(0.01, float(np.max(np.abs(wav)))))).astype(np.int16)
+        chord_audio = AudioSegment(pcm.tobytes(), frame_rate=int(sr), sample_width=2, channels=1)
+        # Chord names carry little above 8 kHz; everything downstream runs on fewer samples
+        if chord_audio.frame_rate > self.TTS_SAMPLE_RATE:
+            chord_audio = chord_audio.set_frame_rate(self.TTS_SAMPLE_RATE)
+        return chord_audio
+    
     def _synthesize_single_chord(self, chord_name: str) -> AudioSegment:
         """
         Synthesize a single chord name to audio using Coqui TTS.
@@ -93,24 +260,24 @@ class VocalSynthesizer:
         if not self.tts:
             raise RuntimeError("TTS engine not initialized")
         
+        cached = self._tts_cache.get(chord_name)
+        if cached is not None:
+            return cached
+        
         try:
-            # Generate audio using Coqui TTS
-            audio_path = self.tts.tts_to_file(
-                text=chord_name,
-                file_path="temp_chord.wav"
-            )
-            
-            # Load the generated audio
-            chord_audio = AudioSegment.from_wav(audio_path)
-            
-            # Clean up temporary file
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
+            # Generate audio using Coqui TTS, building the segment in memory
+            # instead of a round-trip through a scratch wav file
+            with self._tts_lock:
+                wav = np.asarray(self.tts.tts(text=chord_name), dtype=np.float32)
+                sr = self.tts.synthesizer.output_sample_rate
+            chord_audio = self._chord_audio(wav, sr)
             
+            # Only successful synthesis is cached, so failures are retried
+            self._tts_cache[chord_name] = chord_audio
             return chord_audio
             
         except Exception as e:
-            print(f"Error synthesizing chord '{chord_name}': {e}")
+            logger.error("Error synthesizing chord '%s': %s", chord_name, e)
             # Return silence as fallback
             return AudioSegment.silent(duration=1000)  # 1 second of silence
     
@@ -135,9 +302,68 @@ class VocalSynthesizer:
         else:
             # Pad with silence to reach target duration
             padding_duration_ms = target_duration_ms - current_duration_ms
-            padding = AudioSegment.silent(duration=padding_duration_ms)
+            padding = self._silence(padding_duration_ms, audio.frame_rate)
             return audio + padding
     
+    @staticmethod
+    def _float_samples(audio: AudioSegment) -> np.ndarray:
+        """
+        First channel of a 16-bit AudioSegment as float32, read straight from its raw bytes
+        instead of going through get_array_of_samples().
+        
+        Args:
+            audio: 16-bit AudioSegment
+            
+        Returns:
+            Mono float32 samples on the int16 scale
+        """
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+        if audio.channels > 1:
+            samples = samples.reshape(-1, audio.channels)[:, 0]
+        return samples.astype(np.float32)
+    
+    def _int16_bytes(self, samples: np.ndarray) -> bytes:
+        """
+        Saturate float samples to the int16 range and return their int16 bytes, instead of
+        letting the cast wrap around. Works in this thread's scratch buffers, which only
+        grow, so repeated chords don't allocate clip and cast temporaries.
+        
+        Args:
+            samples: Float samples on the int16 scale
+            
+        Returns:
+            Raw little-endian int16 sample bytes
+        """
+        scratch = self._scratch
+        n = len(samples)
+        if getattr(scratch, 'f32', None) is None or len(scratch.f32) < n:
+            size = max(n, self.MAX_CHORD_SAMPLES)
+            scratch.f32 = np.empty(size, dtype=np.float32)
+            scratch.i16 = np.empty(size, dtype=np.int16)
+        clipped = np.clip(samples, -32768, 32767, out=scratch.f32[:n])
+        pcm = scratch.i16[:n]
+        np.copyto(pcm, clipped, casting='unsafe')
+        return pcm.tobytes()
+    
+    def _silence(self, duration_ms: int, frame_rate: int = 22050) -> AudioSegment:
+        """
+        Get a silent segment by slicing a cached one, grown by doubling when too short,
+        instead of allocating fresh silence for every pad.
+        
+        Args:
+            duration_ms: Length of silence in milliseconds
+            frame_rate: Sample rate of the silence
+            
+        Returns:
+            Silent mono AudioSegment
+        """
+        silence = self._silence_cache.get(frame_rate)
+        if silence is None or len(silence) < duration_ms:
+            length_ms = max(5000, duration_ms, 2 * len(silence) if silence is not None else 0)
+            silence = AudioSegment.silent(duration=length_ms, frame_rate=frame_rate)
+            self._silence_cache[frame_rate] = silence
+        return silence[:duration_ms]
+    
     def set_voice_properties(self, rate: int = None, volume: float = None, voice_id: str = None):
         """
         Update voice properties for Coqui TTS.
@@ -175,99 +401,146 @@ class VocalSynthesizer:
         """
         if hasattr(self, 'tts'):
             self.tts = None
+        self._tts_cache.clear()
+        with self._shift_cache_lock:
+            self._shift_cache.clear()
+        if self._audio_cache is not None:
+            with self._audio_cache_lock:
+                self._audio_cache.clear()
+    
+    def _decode_audio(self, audio_path: str) -> Tuple[np.ndarray, int, int]:
+        """
+        Decode an audio file to read-only interleaved int16 samples, reusing earlier
+        decodes of the same unmodified file when audio caching is enabled.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Tuple of (samples, frame_rate, channels)
+        """
+        if self._audio_cache is None:
+            audio = AudioSegment.from_file(audio_path).set_sample_width(2)
+            return np.frombuffer(audio.raw_data, dtype=np.int16), audio.frame_rate, audio.channels
+        
+        key = (audio_path, os.stat(audio_path).st_mtime_ns)
+        with self._audio_cache_lock:
+            cached = self._audio_cache.get(key)
+        if cached is None:
+            audio = AudioSegment.from_file(audio_path).set_sample_width(2)
+            cached = (np.frombuffer(audio.raw_data, dtype=np.int16), audio.frame_rate, audio.channels)
+            with self._audio_cache_lock:
+                # Evict the oldest decode once full
+                while len(self._audio_cache) >= self.AUDIO_CACHE_SIZE:
+                    self._audio_cache.pop(next(iter(self._audio_cache)))
+                self._audio_cache[key] = cached
+        return cached
 
     def synthesize_sung_chord_vocals(self, chord_timeline: List[Tuple[str, float, float]],
                                      melody_contour: List[Tuple[float, float]],
                                      original_audio_duration_sec: float,
-                                     output_path: str,
-                                     original_audio_path: str) -> str:
+                                     output_path: Union[str, BinaryIO],
+                                     original_audio_path: str) -> Union[str, BinaryIO]:
         """
         Synthesize sung chord vocals, pitch-mapped to the melody contour.
         Args:
             chord_timeline: List of (chord_name, start_time, end_time)
             melody_contour: List of (timestamp_sec, frequency_hz) from MelodyExtractor
             original_audio_duration_sec: Total duration of the original audio
-            output_path: Path where the output audio will be saved
+            output_path: Path, or writable binary file object, where the output audio will be saved
             original_audio_path: Path to the original audio file for instrumental track
         Returns:
-            Path to the generated audio file
+            Path to the generated audio file, or the file object it was written to
         """
-        print(f"Synthesizing vocals for {len(chord_timeline)} chords")
-        print(f"Audio duration: {original_audio_duration_sec} seconds")
-        print(f"Output path: {output_path}")
-        print(f"Original audio path: {original_audio_path}")
+        logger.debug("Synthesizing vocals for %d chords", len(chord_timeline))
+        logger.debug("Audio duration: %s seconds", original_audio_duration_sec)
+        logger.debug("Output path: %s", output_path)
+        logger.debug("Original audio path: %s", original_audio_path)
         
         # Load the original instrumental track
+        expected_duration_ms = int(original_audio_duration_sec * 1000)
         try:
-            print(f"Loading original instrumental track from: {original_audio_path}")
-            instrumental_track = AudioSegment.from_file(original_audio_path)
-            print(f"Loaded instrumental track: {len(instrumental_track)} ms")
+            logger.debug("Loading original instrumental track from: %s", original_audio_path)
+            samples, sr, channels = self._decode_audio(original_audio_path)
+            loaded_duration_ms = len(samples) // channels * 1000 // sr
+            logger.debug("Loaded instrumental track: %d ms", loaded_duration_ms)
             
             # Ensure the instrumental track matches the expected duration
-            if len(instrumental_track) != int(original_audio_duration_sec * 1000):
-                print(f"Warning: Instrumental duration mismatch. Expected: {int(original_audio_duration_sec * 1000)}ms, Got: {len(instrumental_track)}ms")
-                # Trim or pad to match expected duration
-                expected_duration_ms = int(original_audio_duration_sec * 1000)
-                if len(instrumental_track) > expected_duration_ms:
-                    instrumental_track = instrumental_track[:expected_duration_ms]
+            if loaded_duration_ms != expected_duration_ms:
+                logger.warning("Instrumental duration mismatch. Expected: %dms, Got: %dms", expected_duration_ms, loaded_duration_ms)
+                # Trim or pad with silence to match expected duration
+                expected_length = expected_duration_ms * sr // 1000 * channels
+                if len(samples) > expected_length:
+                    samples = samples[:expected_length]
                 else:
-                    # Pad with silence
-                    padding_duration = expected_duration_ms - len(instrumental_track)
-                    padding = AudioSegment.silent(duration=padding_duration)
-                    instrumental_track = instrumental_track + padding
+                    samples = np.pad(samples, (0, expected_length - len(samples)))
+            instrumental = samples, sr, channels
         except Exception as e:
-            print(f"Error loading original audio: {e}")
-            print("Falling back to silent instrumental track")
-            instrumental_track = AudioSegment.silent(duration=int(original_audio_duration_sec * 1000))
-        
-        # Generate synthesized vocals
-        vocals_track = AudioSegment.silent(duration=len(instrumental_track))
+            logger.error("Error loading original audio: %s", e)
+            logger.warning("Falling back to silent instrumental track")
+            instrumental = np.zeros(expected_duration_ms * 44100 // 1000, dtype=np.int16), 44100, 1
+        
+        # Synthesize every distinct chord text up front so the per-chord work only hits the cache
+        tts_texts = {chord_name: ' '.join(self.syllabify_chord_name(chord_name))
+                     for chord_name, _, _ in chord_timeline}
+        self._synthesize_chords(self.enhance_for_singing(text) for text in tts_texts.values())
+
+        # Time-sorted contour arrays, so each chord finds its melody segment by binary search
+        contour = np.asarray(melody_contour, dtype=np.float64).reshape(-1, 2)
+        contour = contour[np.argsort(contour[:, 0], kind='stable')]
+        contour_times = contour[:, 0]
 
-        for i, (chord_name, start_time, end_time) in enumerate(chord_timeline):
-            print(f"Processing chord {i+1}/{len(chord_timeline)}: {chord_name} at {start_time}-{end_time}s")
+        def render_chord(job):
+            i, (chord_name, start_time, end_time) = job
+            logger.debug("Processing chord %d/%d: %s at %s-%ss", i + 1, len(chord_timeline), chord_name, start_time, end_time)
             # Find melody segment for this chord
-            melody_points = [(t, f) for (t, f) in melody_contour if start_time <= t < end_time and f > 0]
+            i0, i1 = np.searchsorted(contour_times, (start_time, end_time), side='left')
+            segment = contour[i0:i1]
+            melody_points = list(map(tuple, segment[segment[:, 1] > 0].tolist()))
             chord_duration_ms = int((end_time - start_time) * 1000)
-            syllables = self.syllabify_chord_name(chord_name)
-            tts_text = ' '.join(syllables)
-            print(f"  Melody points: {len(melody_points)}")
+            logger.debug("  Melody points: %d", len(melody_points))
             try:
-                chord_audio = self.sing_chord_name_to_melody_contour(tts_text, melody_points, chord_duration_ms)
-                print(f"  Generated audio length: {len(chord_audio)} ms")
-                vocals_track = vocals_track.overlay(chord_audio, position=int(start_time * 1000))
+                chord_audio = self.sing_chord_name_to_melody_contour(tts_texts[chord_name], melody_points, chord_duration_ms)
+                logger.debug("  Generated audio length: %d ms", len(chord_audio))
+                return int(start_time * 1000), chord_audio
             except Exception as e:
-                print(f"  Error generating audio for chord '{chord_name}': {e}")
+                logger.error("Error generating audio for chord '%s': %s", chord_name, e)
                 # Continue with next chord
+                return None
+
+        # Pitch shifting is librosa/NumPy work that mostly releases the GIL,
+        # so chords are rendered on a thread pool
+        workers = max(1, min(self.DSP_WORKERS, len(chord_timeline)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            placements = [placement for placement in executor.map(render_chord, enumerate(chord_timeline)) if placement]
 
-        print(f"Vocals track length: {len(vocals_track)} ms")
+        vocals_track = mix_clips(placements, expected_duration_ms)
+        logger.debug("Vocals track length: %d ms", len(vocals_track))
         
         # Combine instrumental and vocals
-        # Lower the volume of the instrumental to make vocals more prominent
-        instrumental_track = instrumental_track - 10  # Reduce volume by 10dB
-        vocals_track = vocals_track + 5  # Increase vocals volume by 5dB
+        # Lower the volume of the instrumental (-10 dB) and raise the vocals (+5 dB)
+        # to make the vocals more prominent
+        combined, sr, channels = mix_with_instrumental(instrumental, vocals_track, -10, 5)
         
-        combined_audio = instrumental_track.overlay(vocals_track)
-        
-        print(f"Final combined audio length: {len(combined_audio)} ms")
-        print(f"Exporting to: {output_path}")
+        logger.debug("Final combined audio length: %d ms", len(combined) // channels * 1000 // sr)
+        logger.debug("Exporting to: %s", output_path)
         
         try:
-            combined_audio.export(output_path, format='wav')
-            print(f"Successfully exported audio to: {output_path}")
+            wav_write(output_path, sr, combined.reshape(-1, channels))
+            logger.debug("Successfully exported audio to: %s", output_path)
             
-            # Verify file was created and has content
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                print(f"Output file size: {file_size} bytes")
-                if file_size == 0:
-                    print("Warning: Output file is empty!")
-            else:
-                print("Error: Output file was not created!")
+            # Verify file was created and has content; file objects have nothing to check on disk
+            if isinstance(output_path, (str, os.PathLike)):
+                if os.path.exists(output_path):
+                    file_size = os.path.getsize(output_path)
+                    logger.debug("Output file size: %d bytes", file_size)
+                    if file_size == 0:
+                        logger.warning("Output file is empty!")
+                else:
+                    logger.error("Output file was not created!")
                 
         except Exception as e:
-            print(f"Error exporting audio: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error exporting audio: %s", e)
         
         return output_path
 
@@ -284,7 +557,8 @@ class VocalSynthesizer:
         Returns:
             Pitch-shifted samples with same duration as input
         """
-        if len(samples) < 2:
+        # Shifts within the tolerance aren't audible; skip the phase vocoder
+        if len(samples) < 2 or abs(pitch_factor - 1.0) < self.PITCH_SHIFT_TOLERANCE:
             return samples
         
         # Apply phase vocoder pitch shifting
@@ -300,11 +574,16 @@ class VocalSynthesizer:
             return shifted_samples
             
         except Exception as e:
-            print(f"Phase vocoder failed, falling back to resampling: {e}")
-            # Fallback to resampling if phase vocoder fails
-            new_length = int(len(samples) / pitch_factor)
-            if new_length > 1:
-                return resample(samples, new_length)
+            logger.warning("Phase vocoder failed, falling back to resampling: %s", e)
+            # Fallback to resampling if phase vocoder fails: a JIT-compiled linear
+            # interpolation when numba is available, otherwise polyphase resampling by
+            # a rational approximation of the factor, which avoids FFT-based
+            # resample's slow paths on awkward (e.g. prime) lengths.
+            if NUMBA_AVAILABLE and len(samples) / pitch_factor > 1:
+                return _lerp_resample(np.ascontiguousarray(samples, dtype=np.float32), float(pitch_factor))
+            ratio = Fraction(pitch_factor).limit_denominator(100)
+            if len(samples) * ratio.denominator // ratio.numerator > 1:
+                return resample_poly(samples, ratio.denominator, ratio.numerator)
             else:
                 return samples
 
@@ -322,7 +601,7 @@ class VocalSynthesizer:
         tts_audio = self._synthesize_single_chord(chord_name)
         
         # Convert to numpy array
-        samples = np.array(tts_audio.get_array_of_samples()).astype(np.float32)
+        samples = self._float_samples(tts_audio)
         sr = tts_audio.frame_rate
         
         # Estimate original pitch - Coqui TTS typically generates around 200-300 Hz
@@ -334,17 +613,28 @@ class VocalSynthesizer:
         # Clamp the pitch factor to reasonable bounds (0.5 to 2.0)
         pitch_factor = max(0.5, min(2.0, pitch_factor))
         
-        print(f"    Spectral pitch shift: {orig_pitch_hz:.1f} Hz -> {target_pitch_hz:.1f} Hz (factor: {pitch_factor:.2f})")
-        
-        # Apply spectral pitch shifting (preserves duration)
-        shifted_samples = self._spectral_pitch_shift(samples, sr, pitch_factor)
+        logger.debug("    Spectral pitch shift: %.1f Hz -> %.1f Hz (factor: %.2f)", orig_pitch_hz, target_pitch_hz, pitch_factor)
+        
+        # Apply spectral pitch shifting (preserves duration), reusing earlier
+        # shifts of the same chord to the same pitch
+        shift_key = (chord_name, round(pitch_factor, 3))
+        with self._shift_cache_lock:
+            shifted_samples = self._shift_cache.get(shift_key)
+            if shifted_samples is not None:
+                self._shift_cache.move_to_end(shift_key)
+        if shifted_samples is None:
+            shifted_samples = self._spectral_pitch_shift(samples, sr, pitch_factor)
+            with self._shift_cache_lock:
+                self._shift_cache[shift_key] = shifted_samples
+                while len(self._shift_cache) > self.SHIFT_CACHE_SIZE:
+                    self._shift_cache.popitem(last=False)
         
         # Convert back to AudioSegment
         shifted_audio = AudioSegment(
-            shifted_samples.astype(np.int16).tobytes(),
+            self._int16_bytes(shifted_samples),
             frame_rate=int(sr),
-            sample_width=tts_audio.sample_width,
-            channels=tts_audio.channels
+            sample_width=2,
+            channels=1
         )
         
         # Now adjust duration (stretch or trim)
@@ -364,11 +654,11 @@ class VocalSynthesizer:
         """
         # Enhance the chord name for singing
         enhanced_chord_name = self.enhance_for_singing(chord_name)
-        print(f"    Enhanced text: '{enhanced_chord_name}'")
+        logger.debug("    Enhanced text: '%s'", enhanced_chord_name)
         
         # Generate TTS audio at default pitch
         tts_audio = self._synthesize_single_chord(enhanced_chord_name)
-        samples = np.array(tts_audio.get_array_of_samples()).astype(np.float32)
+        samples = self._float_samples(tts_audio)
         sr = tts_audio.frame_rate
         orig_pitch_hz = 250.0  # Typical Coqui TTS pitch
 
@@ -385,7 +675,7 @@ class VocalSynthesizer:
         segment_length = int(len(samples) / n_segments)
         segments = []
         
-        print(f"    Processing {n_segments} melody segments for '{chord_name}'")
+        logger.debug("    Processing %d melody segments for '%s'", n_segments, chord_name)
         
         for i, (_, freq) in enumerate(melody_segment):
             start = i * segment_length
@@ -394,7 +684,7 @@ class VocalSynthesizer:
             
             # Normalize the target pitch to stay within reasonable range
             if freq > 0:
-                print(f"      Segment {i}: Original freq = {freq:.1f} Hz")
+                logger.debug("      Segment %d: Original freq = %.1f Hz", i, freq)
                 
                 # Find the closest pitch in our target range by octave shifting
                 normalized_freq = freq
@@ -405,17 +695,17 @@ class VocalSynthesizer:
                 
                 # Ensure it's within bounds
                 normalized_freq = max(min_pitch_hz, min(max_pitch_hz, normalized_freq))
-                print(f"      Segment {i}: Normalized freq = {normalized_freq:.1f} Hz")
+                logger.debug("      Segment %d: Normalized freq = %.1f Hz", i, normalized_freq)
             else:
                 normalized_freq = orig_pitch_hz
-                print(f"      Segment {i}: Using default freq = {normalized_freq:.1f} Hz")
+                logger.debug("      Segment %d: Using default freq = %.1f Hz", i, normalized_freq)
             
             # Apply spectral pitch shifting to this segment
             pitch_factor = normalized_freq / orig_pitch_hz
             # Conservative bounds
             pitch_factor = max(0.7, min(1.5, pitch_factor))
             
-            print(f"      Segment {i}: Pitch factor = {pitch_factor:.2f}")
+            logger.debug("      Segment %d: Pitch factor = %.2f", i, pitch_factor)
             
             # Apply spectral pitch shifting (preserves duration)
             shifted_seg = self._spectral_pitch_shift(seg, sr, pitch_factor)
@@ -429,10 +719,10 @@ class VocalSynthesizer:
         
         # Convert back to AudioSegment
         shifted_audio = AudioSegment(
-            all_samples.astype(np.int16).tobytes(),
+            self._int16_bytes(all_samples),
             frame_rate=int(sr),
-            sample_width=tts_audio.sample_width,
-            channels=tts_audio.channels
+            sample_width=2,
+            channels=1
         )
         
         # Adjust duration
@@ -444,37 +734,23 @@ class VocalSynthesizer:
         Break down chord symbols into pronounceable syllables.
         E.g., 'Cmaj7' -> ['C', 'major', 'seven']
         """
+        return list(self._syllabify(chord_name))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _syllabify(chord_name: str) -> Tuple[str, ...]:
+        """Cached implementation of syllabify_chord_name; chord vocabularies are tiny."""
         # Simple rules for common chord types
         chord = chord_name.upper()
-        root = re.match(r'^[A-G][#B]?b?', chord)
+        root = _ROOT_RE.match(chord)
         rest = chord[len(root.group(0)):] if root else chord
         syllables = [root.group(0)] if root else []
-        # Map common chord types
-        mapping = [
-            (r'MAJ7', ['major', 'seven']),
-            (r'MIN7', ['minor', 'seven']),
-            (r'MAJ', ['major']),
-            (r'MIN', ['minor']),
-            (r'M', ['major']),
-            (r'MINOR', ['minor']),
-            (r'AUG', ['augmented']),
-            (r'DIM', ['diminished']),
-            (r'7', ['seven']),
-            (r'6', ['six']),
-            (r'9', ['nine']),
-            (r'11', ['eleven']),
-            (r'13', ['thirteen'])
-        ]
-        found = False
-        for pat, syls in mapping:
-            if rest.startswith(pat):
-                syllables.extend(syls)
-                rest = rest[len(pat):]
-                found = True
-                break
-        if not found and rest:
+        match = _CHORD_RE.match(rest)
+        if match:
+            syllables.extend(_CHORD_SYLLABLES[match.group(0)])
+        elif rest:
             syllables.append(rest.lower())
-        return [s for s in syllables if s]
+        return tuple(s for s in syllables if s)
 
     def enhance_for_singing(self, chord_name: str) -> str:
         """
@@ -3,28 +3,44 @@ Example script demonstrating the AdvancedVocalSynthesizer class with Coqui TTS.
 Shows advanced vocal synthesis with singing enhancements.
 """
 
+import io
 import sys
 import os
 import tempfile
 import asyncio
+import traceback
 
 # Add the backend directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from synthesis.advanced_vocal_synthesis import AdvancedVocalSynthesizer, synthesize_sung_chord_vocals_sync
+from synthesis.advanced_vocal_synthesis import (
+    get_synthesizer, list_available_voices, synthesize_sung_chord_vocals_sync
+)
 
+# Model used by every demo; they share one loaded instance through get_synthesizer
+MODEL_NAME = "tts_models/en/ljspeech/tacotron2-DDC"
+VOCODER_NAME = "vocoder_models/en/ljspeech/hifigan_v2"
 
-async def test_coqui_tts():
-    """Test Coqui TTS synthesis with singing enhancements."""
-    print("\n🎵 Testing Coqui TTS (Advanced Neural TTS)")
-    print("=" * 60)
+
+def _make_temp_wav() -> str:
+    """Create an empty temporary .wav file and return its path."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+        return temp_file.name
+
+
+def _remove_if_exists(path: str):
+    """Delete a file if it is still there."""
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+async def test_coqui_tts(report: io.StringIO):
+    """Test Coqui TTS synthesis with singing enhancements, writing the results to report."""
+    print("\n🎵 Testing Coqui TTS (Advanced Neural TTS)", file=report)
+    print("=" * 60, file=report)
     
-    synthesizer = AdvancedVocalSynthesizer(
-        model_name="tts_models/en/ljspeech/tacotron2-DDC",
-        vocoder_name="vocoder_models/en/ljspeech/hifigan_v2",
-        rate=0.9,
-        volume=0.9
-    )
+    # Synthesis and file operations block, so they run off the event loop
+    synthesizer = get_synthesizer(model_name=MODEL_NAME, vocoder_name=VOCODER_NAME)
     
     # Test with a simple chord progression
     chord_timeline = [
@@ -57,45 +73,37 @@ async def test_coqui_tts():
     # Create a simple instrumental track (just silence for demo)
     instrumental_duration = 8.0
     
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-        output_path = temp_file.name
+    output_path = await asyncio.to_thread(_make_temp_wav)
     
     try:
-        result_path = synthesizer.synthesize_sung_chord_vocals(
+        result_path = await asyncio.to_thread(
+            synthesizer.synthesize_sung_chord_vocals,
             chord_timeline, melody_contour, instrumental_duration,
             output_path, output_path  # Use same file for instrumental (silence)
         )
         
-        print(f"✓ Successfully generated Coqui TTS vocals!")
-        print(f"  Output file: {result_path}")
-        print(f"  Duration: {instrumental_duration} seconds")
+        print(f"✓ Successfully generated Coqui TTS vocals!", file=report)
+        print(f"  Output file: {result_path}", file=report)
+        print(f"  Duration: {instrumental_duration} seconds", file=report)
         
         # Show file size
-        file_size = os.path.getsize(result_path) / 1024  # KB
-        print(f"  File size: {file_size:.1f} KB")
+        file_size = await asyncio.to_thread(os.path.getsize, result_path) / 1024  # KB
+        print(f"  File size: {file_size:.1f} KB", file=report)
         
     except Exception as e:
-        print(f"✗ Error generating Coqui TTS vocals: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"✗ Error generating Coqui TTS vocals: {e}", file=report)
+        traceback.print_exc(file=report)
     
     finally:
-        synthesizer.cleanup()
-        if os.path.exists(output_path):
-            os.unlink(output_path)
+        await asyncio.to_thread(_remove_if_exists, output_path)
 
 
-def test_stable_vocals():
-    """Test stable vocals synthesis (no pitch mapping)."""
-    print("\n🎵 Testing Stable Vocals (No Pitch Mapping)")
-    print("=" * 60)
+def test_stable_vocals(report: io.StringIO):
+    """Test stable vocals synthesis (no pitch mapping), writing the results to report."""
+    print("\n🎵 Testing Stable Vocals (No Pitch Mapping)", file=report)
+    print("=" * 60, file=report)
     
-    synthesizer = AdvancedVocalSynthesizer(
-        model_name="tts_models/en/ljspeech/tacotron2-DDC",
-        vocoder_name="vocoder_models/en/ljspeech/hifigan_v2",
-        rate=0.9,
-        volume=0.9
-    )
+    synthesizer = get_synthesizer(model_name=MODEL_NAME, vocoder_name=VOCODER_NAME)
     
     # Test with a simple chord progression
     chord_timeline = [
@@ -117,28 +125,26 @@ def test_stable_vocals():
             output_path, output_path  # Use same file for instrumental (silence)
         )
         
-        print(f"✓ Successfully generated stable vocals!")
-        print(f"  Output file: {result_path}")
-        print(f"  Duration: {instrumental_duration} seconds")
+        print(f"✓ Successfully generated stable vocals!", file=report)
+        print(f"  Output file: {result_path}", file=report)
+        print(f"  Duration: {instrumental_duration} seconds", file=report)
         
         file_size = os.path.getsize(result_path) / 1024
-        print(f"  File size: {file_size:.1f} KB")
+        print(f"  File size: {file_size:.1f} KB", file=report)
         
     except Exception as e:
-        print(f"✗ Error generating stable vocals: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"✗ Error generating stable vocals: {e}", file=report)
+        traceback.print_exc(file=report)
     
     finally:
-        synthesizer.cleanup()
         if os.path.exists(output_path):
             os.unlink(output_path)
 
 
-def test_sync_wrapper():
-    """Test the synchronous wrapper function."""
-    print("\n🎵 Testing Synchronous Wrapper")
-    print("=" * 60)
+def test_sync_wrapper(report: io.StringIO):
+    """Test the synchronous wrapper function, writing the results to report."""
+    print("\n🎵 Testing Synchronous Wrapper", file=report)
+    print("=" * 60, file=report)
     
     chord_timeline = [
         ("C major", 0.0, 2.0),
@@ -160,53 +166,47 @@ def test_sync_wrapper():
     
     instrumental_duration = 8.0
     
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-        output_path = temp_file.name
+    # The result only needs to be inspected, so it is written to memory instead of a file
+    output_buffer = io.BytesIO()
     
     try:
-        result_path = synthesize_sung_chord_vocals_sync(
+        synthesize_sung_chord_vocals_sync(
             chord_timeline, melody_contour, instrumental_duration,
-            output_path, output_path,
-            model_name="tts_models/en/ljspeech/tacotron2-DDC",
-            vocoder_name="vocoder_models/en/ljspeech/hifigan_v2"
+            output_buffer, "",  # No instrumental file; the synthesizer falls back to silence
+            model_name=MODEL_NAME,
+            vocoder_name=VOCODER_NAME
         )
         
-        print(f"✓ Successfully generated vocals using sync wrapper!")
-        print(f"  Output file: {result_path}")
-        print(f"  Duration: {instrumental_duration} seconds")
+        print(f"✓ Successfully generated vocals using sync wrapper!", file=report)
+        print(f"  Duration: {instrumental_duration} seconds", file=report)
         
-        file_size = os.path.getsize(result_path) / 1024
-        print(f"  File size: {file_size:.1f} KB")
+        file_size = output_buffer.getbuffer().nbytes / 1024
+        print(f"  File size: {file_size:.1f} KB", file=report)
         
     except Exception as e:
-        print(f"✗ Error generating vocals: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    finally:
-        if os.path.exists(output_path):
-            os.unlink(output_path)
+        print(f"✗ Error generating vocals: {e}", file=report)
+        traceback.print_exc(file=report)
 
 
-def test_available_voices():
-    """Test getting available Coqui TTS voices."""
-    print("\n🎵 Testing Available Coqui TTS Voices")
-    print("=" * 60)
+def test_available_voices(report: io.StringIO):
+    """Test getting available Coqui TTS voices, writing the results to report."""
+    print("\n🎵 Testing Available Coqui TTS Voices", file=report)
+    print("=" * 60, file=report)
     
     try:
-        synthesizer = AdvancedVocalSynthesizer()
-        voices = synthesizer.get_available_voices()
+        # Listing voices doesn't need a loaded model
+        voices = list_available_voices()
         
-        print(f"✓ Found {len(voices)} available Coqui TTS models")
-        print("\nCoqui TTS Models (first 10):")
+        print(f"✓ Found {len(voices)} available Coqui TTS models", file=report)
+        print("\nCoqui TTS Models (first 10):", file=report)
         for i, voice in enumerate(voices[:10]):
-            print(f"  {i+1}. {voice['name']} (ID: {voice['id']})")
+            print(f"  {i+1}. {voice['name']} (ID: {voice['id']})", file=report)
         
         if len(voices) > 10:
-            print(f"  ... and {len(voices) - 10} more models")
+            print(f"  ... and {len(voices) - 10} more models", file=report)
         
     except Exception as e:
-        print(f"  Error getting Coqui TTS voices: {e}")
+        print(f"  Error getting Coqui TTS voices: {e}", file=report)
 
 
 async def main():
@@ -220,17 +220,26 @@ async def main():
     print("  • Stable vocals for learning")
     print("  • Natural-sounding chord pronunciation")
     
-    # Test Coqui TTS with pitch mapping
-    await test_coqui_tts()
+    # Load the shared model once up front; every synthesis demo reuses it, taking turns
+    # on its model lock, instead of each holding a copy in memory
+    synthesizer = await asyncio.to_thread(get_synthesizer, model_name=MODEL_NAME, vocoder_name=VOCODER_NAME)
     
-    # Test stable vocals (no pitch mapping)
-    test_stable_vocals()
-    
-    # Test synchronous wrapper
-    test_sync_wrapper()
+    # Run every demo concurrently: Coqui TTS with pitch mapping, stable vocals (no pitch
+    # mapping), the synchronous wrapper and the voice listing. Each one writes its report
+    # to its own buffer, printed in order once all have finished, so results don't interleave.
+    reports = [io.StringIO() for _ in range(4)]
+    try:
+        await asyncio.gather(
+            test_coqui_tts(reports[0]),
+            asyncio.to_thread(test_stable_vocals, reports[1]),
+            asyncio.to_thread(test_sync_wrapper, reports[2]),
+            asyncio.to_thread(test_available_voices, reports[3]),
+        )
+    finally:
+        synthesizer.cleanup()
     
-    # Test available voices
-    test_available_voices()
+    for report in reports:
+        print(report.getvalue(), end="")
     
     print("\n🎵 Example completed!")
     print("All tests should have generated audio files with:")
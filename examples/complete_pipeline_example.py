@@ -5,6 +5,8 @@ Example script demonstrating the complete AI Music Coach pipeline.
 import sys
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
 
 # Add the backend directory to the path
@@ -68,19 +70,16 @@ def main():
     print("Complete pipeline example finished!")
 
 
-def create_test_audio():
-    """Create a simple test audio file with a chord progression."""
+@lru_cache(maxsize=None)
+def _chord_progression_samples(sample_rate: int = 44100, duration_seconds: float = 8.0):
+    """
+    Synthesize the test chord progression once as read-only 16-bit PCM;
+    every test file created during a run reuses it.
+    """
     import numpy as np
-    from pydub import AudioSegment
     
-    # Create a simple chord progression (C major, A minor, F major, G major)
-    sample_rate = 44100
-    duration_seconds = 8.0
     samples = int(sample_rate * duration_seconds)
     
-    # Create time array
-    t = np.linspace(0, duration_seconds, samples, False)
-    
     # Define chord frequencies
     chords = [
         # C major (C, E, G)
@@ -94,35 +93,48 @@ def create_test_audio():
     ]
     
     # Create audio data
-    audio_data = np.zeros(samples)
+    audio_data = np.zeros(samples, dtype=np.float32)
     chord_duration = duration_seconds / len(chords)
     samples_per_chord = int(samples / len(chords))
     
-    for i, chord_freqs in enumerate(chords):
-        start_sample = i * samples_per_chord
-        end_sample = start_sample + samples_per_chord
-        
-        # Create chord by summing sine waves
-        chord_audio = np.zeros(samples_per_chord)
-        for freq in chord_freqs:
-            chord_audio += np.sin(2 * np.pi * freq * np.linspace(0, chord_duration, samples_per_chord, False))
-        
-        audio_data[start_sample:end_sample] = chord_audio
+    # Time array shared by every chord
+    t = np.linspace(0, chord_duration, samples_per_chord, endpoint=False, dtype=np.float32)
+    
+    # One row per chord, viewing audio_data so each worker writes its chord in place
+    chord_blocks = audio_data[:len(chords) * samples_per_chord].reshape(len(chords), samples_per_chord)
+    
+    def render_chord(i):
+        # Broadcast sin over (notes, samples), then sum the notes of the chord;
+        # numpy releases the GIL inside both, so the chords render in parallel
+        freqs = np.asarray(chords[i], dtype=np.float32)[:, None]
+        np.sum(np.sin(np.float32(2 * np.pi) * freqs * t), axis=0, out=chord_blocks[i])
     
-    # Normalize and convert to 16-bit PCM
-    audio_data = audio_data / np.max(np.abs(audio_data))
-    audio_data = (audio_data * 32767).astype(np.int16)
+    with ThreadPoolExecutor(max_workers=len(chords)) as executor:
+        list(executor.map(render_chord, range(len(chords))))
     
-    # Create AudioSegment
-    audio = AudioSegment(audio_data.tobytes(), frame_rate=sample_rate, 
-                        sample_width=2, channels=1)
+    # Convert to 16-bit PCM. A chord sums three unit sines, so dividing by the chord size
+    # bounds it to [-1, 1] without measuring the peak
+    audio_data *= np.float32(32767 / max(len(chord_freqs) for chord_freqs in chords))
+    audio_data = audio_data.astype(np.int16)
+    audio_data.flags.writeable = False
+    
+    return audio_data
+
+
+def create_test_audio():
+    """Create a simple test audio file with a chord progression."""
+    import soundfile as sf
+    
+    sample_rate = 44100
+    audio_data = _chord_progression_samples(sample_rate)
     
-    # Save to temporary file
+    # Save to temporary file; the samples are already 16-bit PCM, so libsndfile
+    # writes them directly without going through pydub/ffmpeg
     temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
     temp_path = temp_file.name
     temp_file.close()
     
-    audio.export(temp_path, format='wav')
+    sf.write(temp_path, audio_data, sample_rate, subtype='PCM_16')
     
     return temp_path
 
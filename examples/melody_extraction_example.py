@@ -6,7 +6,7 @@ Example script demonstrating the MelodyExtractor functionality.
 import sys
 import os
 import numpy as np
-from pydub import AudioSegment
+import soundfile as sf
 
 # Add the backend directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
@@ -42,41 +42,27 @@ def create_test_audio(output_path: str, duration_ms: int = 5000):
     
     # Calculate samples per note
     samples_per_note = int(sample_rate * duration_seconds / len(note_frequencies))
-    total_samples = samples_per_note * len(note_frequencies)
-    
-    # Create audio data
-    audio_data = np.zeros(total_samples)
-    
-    for i, freq in enumerate(note_frequencies):
-        start_sample = i * samples_per_note
-        end_sample = start_sample + samples_per_note
-        
-        # Create time array for this note
-        t = np.linspace(0, samples_per_note / sample_rate, samples_per_note, False)
-        
-        # Generate sine wave for this note
-        note_audio = np.sin(2 * np.pi * freq * t)
-        
-        # Apply simple envelope to avoid clicks
-        envelope = np.ones(samples_per_note)
-        fade_samples = int(0.01 * sample_rate)  # 10ms fade
-        envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-        envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
-        
-        note_audio = note_audio * envelope
-        
-        audio_data[start_sample:end_sample] = note_audio
-    
-    # Normalize and convert to 16-bit PCM
-    audio_data = audio_data / np.max(np.abs(audio_data))
-    audio_data = (audio_data * 32767).astype(np.int16)
-    
-    # Create AudioSegment
-    audio = AudioSegment(audio_data.tobytes(), frame_rate=sample_rate, 
-                       sample_width=2, channels=1)
-    
-    # Save to file
-    audio.export(output_path, format='wav')
+    
+    # Generate every note at once: one row of sine samples per note, each starting at phase 0
+    t = np.arange(samples_per_note, dtype=np.float32) / np.float32(sample_rate)
+    notes = np.sin(np.float32(2 * np.pi) * np.asarray(note_frequencies, dtype=np.float32)[:, None] * t)
+    
+    # Apply simple envelope to avoid clicks, shared by all notes. It also carries the
+    # 16-bit full-scale factor: sines peak at 1.0, so no normalization pass is needed
+    envelope = np.full(samples_per_note, 32767, dtype=np.float32)
+    fade_samples = int(0.01 * sample_rate)  # 10ms fade
+    envelope[:fade_samples] *= np.linspace(0, 1, fade_samples, dtype=np.float32)
+    envelope[-fade_samples:] *= np.linspace(1, 0, fade_samples, dtype=np.float32)
+    
+    np.multiply(notes, envelope, out=notes)
+    np.rint(notes, out=notes)
+    
+    # Convert to 16-bit PCM straight into the output buffer
+    audio_data = np.empty(notes.size, dtype=np.int16)
+    np.copyto(audio_data.reshape(notes.shape), notes, casting='unsafe')
+    
+    # Save to file as plain 16-bit PCM
+    sf.write(output_path, audio_data, sample_rate, subtype='PCM_16')
     print(f"Test audio created successfully: {output_path}")
 
 
@@ -108,8 +94,7 @@ def main():
     
     # Display first few melody frames
     print("First 10 melody frames (timestamp, frequency):")
-    for i, (timestamp, freq) in enumerate(melody_data[:10]):
-        print(f"  {timestamp:.3f}s: {freq:.1f} Hz")
+    print("\n".join(f"  {timestamp:.3f}s: {freq:.1f} Hz" for timestamp, freq in melody_data[:10]))
     print()
     
     # Convert to note names
@@ -117,8 +102,7 @@ def main():
     notes = extractor.get_melody_notes(melody_data)
     
     print("First 10 notes (timestamp, note):")
-    for i, (timestamp, note) in enumerate(notes[:10]):
-        print(f"  {timestamp:.3f}s: {note}")
+    print("\n".join(f"  {timestamp:.3f}s: {note}" for timestamp, note in notes[:10]))
     print()
     
     # Get melody statistics
@@ -136,14 +120,16 @@ def main():
     segments = extractor.get_melody_segments(melody_data, min_segment_duration=0.1)
     print(f"Found {len(segments)} melody segments")
     
+    lines = []
     for i, segment in enumerate(segments[:3]):  # Show first 3 segments
         if segment:
-            start_time = segment[0][0]
-            end_time = segment[-1][0]
+            frames = np.asarray(segment)
+            start_time, end_time = frames[0, 0], frames[-1, 0]
             duration = end_time - start_time
-            avg_freq = np.mean([freq for _, freq in segment])
-            print(f"  Segment {i+1}: {start_time:.3f}s - {end_time:.3f}s "
-                  f"(duration: {duration:.3f}s, avg freq: {avg_freq:.1f} Hz)")
+            avg_freq = frames[:, 1].mean()
+            lines.append(f"  Segment {i+1}: {start_time:.3f}s - {end_time:.3f}s "
+                         f"(duration: {duration:.3f}s, avg freq: {avg_freq:.1f} Hz)")
+    print("\n".join(lines))
     print()
     
     # Test with different parameters
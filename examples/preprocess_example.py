@@ -8,8 +8,6 @@ import os
 # Add the backend directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from audio_processing.audio_utils import preprocess_audio, AudioProcessor
-
 
 def main():
     """Demonstrate the preprocess_audio function."""
@@ -31,6 +29,9 @@ def main():
         
         print("Function signature: preprocess_audio(audio_path: str) -> Tuple[str, float]")
         print("Returns: (processed_file_path, duration_in_seconds)")
+        from audio_processing.audio_utils import PROCESSED_CHANNELS, PROCESSED_SAMPLE_RATE
+        print(f"Output format: {PROCESSED_CHANNELS} channel(s) at {PROCESSED_SAMPLE_RATE} Hz, "
+              "so there is no need to re-open the file to check")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -39,6 +40,9 @@ def main():
     print("\n2. Using AudioProcessor class:")
     
     try:
+        # Imported here so the documentation-only sections don't load pydub and librosa
+        from audio_processing.audio_utils import AudioProcessor
+        
         processor = AudioProcessor()
         print("Created AudioProcessor instance")
         
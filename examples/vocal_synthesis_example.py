@@ -2,18 +2,18 @@
 Example script demonstrating the VocalSynthesizer class for spoken chord vocals.
 """
 
+import io
 import sys
 import os
-import tempfile
 
 # Add the backend directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from synthesis.vocal_synthesis import VocalSynthesizer
-
 
 def main():
     """Demonstrate the VocalSynthesizer functionality."""
+    # Imported here so --usage doesn't load Coqui TTS, librosa and pydub
+    from synthesis.vocal_synthesis import VocalSynthesizer
     
     print("AI Music Coach - Vocal Synthesis Example")
     print("=" * 50)
@@ -46,21 +46,19 @@ def main():
     print("\n4. Synthesizing spoken chord vocals...")
     original_duration = 10.0  # 10 seconds
     
-    # Create temporary output file
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-        output_path = temp_file.name
+    # Write the result to memory; it is only inspected, never kept
+    output_buffer = io.BytesIO()
     
     try:
-        result_path = synthesizer.synthesize_spoken_chord_vocals(
-            chord_timeline, original_duration, output_path
+        synthesizer.synthesize_spoken_chord_vocals(
+            chord_timeline, original_duration, output_buffer
         )
         
         print(f"✓ Successfully generated spoken chord vocals!")
-        print(f"  Output file: {result_path}")
         print(f"  Duration: {original_duration} seconds")
         
         # Show file size
-        file_size = os.path.getsize(result_path) / 1024  # KB
+        file_size = output_buffer.getbuffer().nbytes / 1024  # KB
         print(f"  File size: {file_size:.1f} KB")
         
     except Exception as e:
@@ -69,10 +67,16 @@ def main():
     finally:
         # Clean up
         synthesizer.cleanup()
-        if os.path.exists(output_path):
-            os.unlink(output_path)
     
     print("\n5. Usage example:")
+    print_usage()
+    
+    print("\n" + "=" * 50)
+    print("Vocal synthesis example completed!")
+
+
+def print_usage():
+    """Print the VocalSynthesizer usage example."""
     print("""
 # Basic usage
 synthesizer = VocalSynthesizer()
@@ -89,10 +93,11 @@ voices = synthesizer.get_available_voices()
 for voice in voices:
     print(f"{voice['name']}: {voice['id']}")
     """)
-    
-    print("\n" + "=" * 50)
-    print("Vocal synthesis example completed!")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # --usage prints the usage example without loading the TTS model
+    if "--usage" in sys.argv[1:]:
+        print_usage()
+    else:
+        main() 
\ No newline at end of file
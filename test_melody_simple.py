@@ -5,43 +5,71 @@ Simple test script for MelodyExtractor.
 
 import sys
 import os
+from functools import lru_cache
 import numpy as np
-from pydub import AudioSegment
+import soundfile as sf
 
-# Add the backend directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
-
-# Import directly from the module file to avoid dependency issues
+# Import directly from the module file to avoid dependency issues; nothing else
+# from the backend is needed, so only this one directory goes on the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend', 'audio_processing'))
 from melody_extraction import MelodyExtractor
 
+# Optional JIT for the tone generator
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sine_kernel(frequency, sample_rate, samples):
+        """Unit sine in float32, one sample per loop iteration, split across cores."""
+        out = np.empty(samples, dtype=np.float32)
+        step = np.float32(2.0 * np.pi * frequency / sample_rate)
+        for i in prange(samples):
+            out[i] = np.sin(step * np.float32(i))
+        return out
+else:
+    def _sine_kernel(frequency, sample_rate, samples):
+        """Unit sine in float32: phase per sample in one multiply over a float32 sample index."""
+        out = np.arange(samples, dtype=np.float32)
+        np.multiply(out, np.float32(2 * np.pi * frequency / sample_rate), out=out)
+        np.sin(out, out=out)
+        return out
+
+
+@lru_cache(maxsize=None)
+def _sine_tone(duration_ms: int, frequency: float, sample_rate: int = 22050) -> np.ndarray:
+    """Generate a single 16-bit tone once per (duration, frequency); the array is read-only."""
+    samples = int(sample_rate * duration_ms / 1000.0)
+    
+    audio_data = _sine_kernel(frequency, sample_rate, samples)
+    
+    # Convert to 16-bit PCM, scaling in place in float32; a sine already spans [-1, 1],
+    # so there is nothing to normalize
+    np.multiply(audio_data, np.float32(32767), out=audio_data)
+    np.rint(audio_data, out=audio_data)
+    np.clip(audio_data, -32768, 32767, out=audio_data)
+    audio_data = audio_data.astype(np.int16)
+    audio_data.flags.writeable = False
+    return audio_data
+
 
 def create_test_audio(output_path: str, duration_ms: int = 3000, frequency: float = 440.0):
-    """Create a test audio file with a single tone."""
+    """Create a test audio file with a single tone, returning its samples and sample rate."""
     print(f"Creating test audio file: {output_path}")
     
-    # Generate a simple sine wave
+    # Generate a simple sine wave, reused for repeated (duration, frequency) requests
     sample_rate = 22050
-    duration_seconds = duration_ms / 1000.0
-    samples = int(sample_rate * duration_seconds)
+    audio_data = _sine_tone(duration_ms, frequency, sample_rate)
     
-    # Create time array
-    t = np.linspace(0, duration_seconds, samples, False)
-    
-    # Generate sine wave
-    audio_data = np.sin(2 * np.pi * frequency * t)
-    
-    # Normalize and convert to 16-bit PCM
-    audio_data = audio_data / np.max(np.abs(audio_data))
-    audio_data = (audio_data * 32767).astype(np.int16)
-    
-    # Create AudioSegment
-    audio = AudioSegment(audio_data.tobytes(), frame_rate=sample_rate, 
-                       sample_width=2, channels=1)
-    
-    # Save to file
-    audio.export(output_path, format='wav')
+    # Save to file as plain 16-bit PCM
+    sf.write(output_path, audio_data, sample_rate, subtype='PCM_16')
     print(f"Test audio created successfully: {output_path}")
+    
+    return audio_data, sample_rate
 
 
 def main():
@@ -50,7 +78,9 @@ def main():
     
     # Create test audio file
     test_audio_path = "test_tone.wav"
-    create_test_audio(test_audio_path, duration_ms=2000, frequency=440.0)
+    test_samples, test_sr = create_test_audio(test_audio_path, duration_ms=2000, frequency=440.0)
+    info = sf.info(test_audio_path)
+    print(f"Test file: {info.channels} channel(s), {info.samplerate} Hz, {info.duration:.2f}s")
     
     # Initialize MelodyExtractor
     print("Initializing MelodyExtractor...")
@@ -95,11 +125,10 @@ def main():
             print(f"  {key}: {value}")
     print()
     
-    # Test with audio array
+    # Test with audio array, reusing the generated samples instead of decoding the file again
     print("Testing with audio array...")
-    import librosa
-    audio, sr = librosa.load(test_audio_path, sr=None)
-    array_melody_data = extractor.extract_melody_from_array(audio, sr)
+    audio = test_samples.astype(np.float32) / 32768.0
+    array_melody_data = extractor.extract_melody_from_array(audio, test_sr)
     print(f"Array extraction found {len(array_melody_data)} frames")
     
     print("\n=== Test completed successfully ===")